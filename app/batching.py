@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from collections.abc import Awaitable, Callable
+from typing import Any, Generic, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.cache import DEFERRED_CACHE_WRITES, DeferredCacheWrites
+
+logger = logging.getLogger("batching")
+
+# Queue consumers apply up to this many messages per transaction, waiting at most
+# RABBIT_BATCH_WAIT_MS for a batch to fill. A size of 1 commits every message.
+RABBIT_BATCH_SIZE = int(os.getenv("RABBIT_BATCH_SIZE", "100"))
+RABBIT_BATCH_WAIT_MS = float(os.getenv("RABBIT_BATCH_WAIT_MS", "50"))
+# A batcher applies its batches one after another on one connection; each queue
+# runs this many batchers side by side to use that many pooled connections.
+RABBIT_BATCH_LANES = int(os.getenv("RABBIT_BATCH_LANES", "4"))
+
+M = TypeVar("M")
+R = TypeVar("R")
+
+
+class MessageBatcher(Generic[M, R]):
+    """Apply messages from concurrent handlers in shared transactions.
+
+    Handlers call ``submit`` and wait for their message's outcome. Messages are
+    grouped into batches of up to ``max_size`` or ``max_wait_ms``; a batch runs in
+    one database transaction that is committed once. Each message runs inside
+    its own savepoint with a session joined via ``create_savepoint``: a service
+    ``commit()`` only releases a nested savepoint, and a failure anywhere in the
+    handler rolls back the message's savepoint, so that message alone.
+
+    A service's cache writes would run before the batch is committed, so each
+    session carries a ``DeferredCacheWrites`` in ``session.info`` under
+    ``DEFERRED_CACHE_WRITES``. They are applied after the commit; if it fails
+    their keys are evicted instead.
+
+    The batch holds its row locks until the single commit. ``prepare`` runs
+    first in the same transaction with all of the batch's messages, so it can
+    take those locks up front in a global order (see ``lock_rows``) and keep
+    concurrent batches and API writes from deadlocking on them.
+    """
+
+    def __init__(
+        self,
+        handle: Callable[[AsyncSession, M], Awaitable[R]],
+        bind: AsyncEngine,
+        *,
+        max_size: int = RABBIT_BATCH_SIZE,
+        max_wait_ms: float = RABBIT_BATCH_WAIT_MS,
+        on_commit: Callable[[], Awaitable[None]] | None = None,
+        prepare: Callable[[AsyncSession, list[M]], Awaitable[None]] | None = None,
+    ) -> None:
+        self._handle = handle
+        self._bind = bind
+        self._max_size = max(1, max_size)
+        self._max_wait = max_wait_ms / 1000
+        self._on_commit = on_commit
+        self._prepare = prepare
+        self._queue: asyncio.Queue[tuple[M, asyncio.Future[R]]] = asyncio.Queue()
+        self._runner: asyncio.Task[None] | None = None
+
+    async def submit(self, message: M) -> R:
+        """Queue ``message`` and wait until its batch has been committed."""
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._run())
+        future: asyncio.Future[R] = asyncio.get_running_loop().create_future()
+        await self._queue.put((message, future))
+        return await future
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            self._runner.cancel()
+            await asyncio.gather(self._runner, return_exceptions=True)
+            self._runner = None
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            future.cancel()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._max_wait
+            while len(batch) < self._max_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._apply(batch)
+            except asyncio.CancelledError:
+                for _, future in batch:
+                    future.cancel()
+                raise
+
+    async def _apply(self, batch: list[tuple[M, asyncio.Future[R]]]) -> None:
+        outcomes: list[Any] = []
+        cache_writes: list[DeferredCacheWrites] = []
+        try:
+            async with self._bind.connect() as connection:
+                async with connection.begin():
+                    if self._prepare is not None:
+                        await self._run_prepare(connection, [m for m, _ in batch])
+                    for message, _ in batch:
+                        writes = DeferredCacheWrites()
+                        outcome = await self._apply_one(connection, message, writes)
+                        outcomes.append(outcome)
+                        if not isinstance(outcome, BaseException):
+                            cache_writes.append(writes)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            # The shared commit failed: none of the batch was stored.
+            logger.exception("Failed to commit a batch of %d messages", len(batch))
+            outcomes = [exc] * len(batch)
+            await self._settle_cache(cache_writes, committed=False)
+        else:
+            await self._settle_cache(cache_writes, committed=True)
+
+        for (_, future), outcome in zip(batch, outcomes):
+            if future.done():
+                continue
+            if isinstance(outcome, BaseException):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+    async def _apply_one(
+        self, connection: Any, message: M, cache_writes: DeferredCacheWrites
+    ) -> R | Exception:
+        # Services commit partway through a handler, which only releases the
+        # session's own savepoint. The outer one spans the whole handler, so a
+        # later failure still undoes everything the message wrote.
+        savepoint = await connection.begin_nested()
+        try:
+            async with AsyncSession(
+                bind=connection,
+                join_transaction_mode="create_savepoint",
+                expire_on_commit=False,
+                info={DEFERRED_CACHE_WRITES: cache_writes},
+            ) as session:
+                result = await self._handle(session, message)
+                await session.commit()
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            await savepoint.rollback()
+            return exc
+        await savepoint.commit()
+        return result
+
+    async def _run_prepare(self, connection: Any, messages: list[M]) -> None:
+        assert self._prepare is not None
+        async with AsyncSession(
+            bind=connection, join_transaction_mode="create_savepoint"
+        ) as session:
+            await self._prepare(session, messages)
+            # Releasing (not rolling back) the savepoint keeps the locks.
+            await session.commit()
+
+    async def _settle_cache(
+        self, cache_writes: list[DeferredCacheWrites], *, committed: bool
+    ) -> None:
+        # The database outcome is final here; a cache error must not change it.
+        try:
+            for writes in cache_writes:
+                await (writes.apply() if committed else writes.revert())
+            if committed and self._on_commit is not None:
+                await self._on_commit()
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception("Failed to update the cache after a batch")
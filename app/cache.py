@@ -1,17 +1,455 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import math
 import os
-from collections.abc import AsyncIterator
+import random
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager, suppress
+from typing import Any, Awaitable, Callable, TypeVar
+from uuid import uuid4
 
-from redis.asyncio import Redis
+from litestar import Litestar
+from litestar.datastructures import State
+from pydantic import BaseModel
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger("cache")
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+# Upper bound of open connections per process; callers wait for a free one.
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+REDIS_POOL_TIMEOUT_SECONDS = float(os.getenv("REDIS_POOL_TIMEOUT_SECONDS", "5"))
+REDIS_SOCKET_TIMEOUT_SECONDS = float(os.getenv("REDIS_SOCKET_TIMEOUT_SECONDS", "2"))
+
+# In-process tier in front of Redis. The TTL bounds staleness should an
+# invalidation message be lost while the subscriber reconnects.
+LOCAL_CACHE_MAX_ENTRIES = int(os.getenv("LOCAL_CACHE_MAX_ENTRIES", "1024"))
+LOCAL_CACHE_TTL_SECONDS = float(os.getenv("LOCAL_CACHE_TTL_SECONDS", "30"))
+CACHE_INVALIDATION_CHANNEL = "cache:invalidate"
+# Stampede protection: one loader per key holds a short Redis lock while the
+# others poll for its result, and written TTLs are shortened by up to 10%.
+CACHE_LOCK_TTL_MS = int(os.getenv("CACHE_LOCK_TTL_MS", "5000"))
+CACHE_LOCK_WAIT_SECONDS = float(os.getenv("CACHE_LOCK_WAIT_SECONDS", "2"))
+CACHE_LOCK_POLL_SECONDS = 0.05
+CACHE_TTL_JITTER = float(os.getenv("CACHE_TTL_JITTER", "0.1"))
+CACHE_XFETCH_BETA = float(os.getenv("CACHE_XFETCH_BETA", "1.0"))
+# Not-found results are remembered briefly so unknown ids skip the database.
+CACHE_TOMBSTONE_TTL_SECONDS = int(os.getenv("CACHE_TOMBSTONE_TTL_SECONDS", "30"))
+CACHE_TOMBSTONE = "null"
+# Lets a process skip the invalidations it published itself.
+PROCESS_TOKEN = uuid4().hex
+
+# Compare-and-delete in one step: between a separate GET and DEL the lock could
+# expire and be taken by another loader, whose lock the DEL would then drop.
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+T = TypeVar("T", bound=BaseModel)
+K = TypeVar("K")
+
+
+class CacheStats:
+    """Hit and miss counters for each cache tier."""
+
+    def __init__(self) -> None:
+        self.local_hits = 0
+        self.local_misses = 0
+        self.redis_hits = 0
+        self.redis_misses = 0
+
+    def snapshot(self) -> dict[str, int]:
+        return dict(vars(self))
+
+
+class LocalCache:
+    """Size-bounded LRU with a per-entry TTL, local to the process."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+LOCAL_CACHE = LocalCache(LOCAL_CACHE_MAX_ENTRIES, LOCAL_CACHE_TTL_SECONDS)
+# ``Session.info`` key under which a batch consumer hands each message's
+# DeferredCacheWrites to the services it builds.
+DEFERRED_CACHE_WRITES = "deferred_cache_writes"
+CACHE_STATS = CacheStats()
+# Loads currently running in this process, keyed by cache key.
+_INFLIGHT: dict[str, asyncio.Future[Any]] = {}
+# Latest recompute time per key namespace, the XFetch ``delta``.
+_LOAD_SECONDS: dict[str, float] = {}
+# Local-tier stand-in for a cached "not found".
+_TOMBSTONE = object()
+
+
+class DeferredCacheWrites:
+    """Cache writes held back until the transaction that made them commits.
+
+    In a batch consumer a service ``commit()`` only releases a savepoint, so
+    writing the cache there would publish rows that are not committed yet.
+    Each write is recorded with the eviction that undoes it: ``apply`` runs the
+    writes after the commit, ``revert`` evicts their keys when it failed.
+    """
+
+    def __init__(self) -> None:
+        self._writes: list[
+            tuple[Callable[[], Awaitable[None]], Callable[[], Awaitable[None]]]
+        ] = []
+
+    def __len__(self) -> int:
+        return len(self._writes)
+
+    def add(
+        self, write: Callable[[], Awaitable[None]], evict: Callable[[], Awaitable[None]]
+    ) -> None:
+        self._writes.append((write, evict))
+
+    async def apply(self) -> None:
+        writes, self._writes = self._writes, []
+        for write, _ in writes:
+            await write()
+
+    async def revert(self) -> None:
+        writes, self._writes = self._writes, []
+        for _, evict in writes:
+            await evict()
+
+
+class TieredCache:
+    """Read-through pair of the process-local LRU and the shared Redis.
+
+    ``get_or_load`` rebuilds each key once per expiry: concurrent misses in a
+    process share one load, a short Redis lock elects a single loader across
+    processes, and XFetch refreshes hot keys shortly before they expire.
+    A ``None`` load result is cached as a short-lived tombstone.
+
+    With ``deferred`` the ``set`` and ``invalidate`` calls of a write path are
+    only recorded there, to be applied once the database transaction commits.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        local: LocalCache = LOCAL_CACHE,
+        stats: CacheStats = CACHE_STATS,
+        inflight: dict[str, asyncio.Future[Any]] | None = None,
+        deferred: DeferredCacheWrites | None = None,
+    ) -> None:
+        self._redis = redis
+        self._local = local
+        self._stats = stats
+        self._inflight = _INFLIGHT if inflight is None else inflight
+        self._deferred = deferred
+
+    async def get_or_load(
+        self,
+        key: str,
+        loads: Callable[[str], T],
+        load: Callable[[], Awaitable[T | None]],
+        ttl_seconds: int,
+    ) -> T | None:
+        """Return the cached value for ``key`` or build it with ``load``."""
+        value = self._local.get(key)
+        if value is not None:
+            self._stats.local_hits += 1
+            return None if value is _TOMBSTONE else value
+        self._stats.local_misses += 1
+
+        pending = self._inflight.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(
+                self._fetch_remote(key, loads, load, ttl_seconds)
+            )
+            self._inflight[key] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so a cancelled caller does not abort the load others await.
+        value = await asyncio.shield(pending)
+        return None if value is _TOMBSTONE else value
+
+    async def get_many(
+        self,
+        keys: Mapping[str, K],
+        loads: Callable[[str], T],
+        load_many: Callable[[list[K]], Awaitable[Mapping[K, T]]],
+        ttl_seconds: int,
+    ) -> dict[str, T]:
+        """Batch lookup of ``keys`` (cache key -> id) with one MGET and one load.
 
+        Ids missing from both tiers are passed to ``load_many`` together; found
+        values and tombstones for the rest are written back in one pipeline.
+        """
+        found: dict[str, Any] = {}
+        remote_keys = []
+        for key in keys:
+            value = self._local.get(key)
+            if value is None:
+                remote_keys.append(key)
+            else:
+                found[key] = value
+        self._stats.local_hits += len(found)
+        self._stats.local_misses += len(remote_keys)
 
-async def get_redis_client() -> AsyncIterator[Redis]:
-    """Yield a Redis client configured from the environment."""
-    client = Redis.from_url(REDIS_URL, decode_responses=True)
+        missing = []
+        if remote_keys:
+            for key, raw in zip(remote_keys, await self._redis.mget(remote_keys)):
+                if raw is None:
+                    missing.append(key)
+                    continue
+                found[key] = _decode(raw, loads)
+                self._local.set(key, found[key])
+            self._stats.redis_hits += len(remote_keys) - len(missing)
+            self._stats.redis_misses += len(missing)
+
+        if missing:
+            loaded = await load_many([keys[key] for key in missing])
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for key in missing:
+                    value = loaded.get(keys[key])
+                    if value is None:
+                        pipe.setex(key, CACHE_TOMBSTONE_TTL_SECONDS, CACHE_TOMBSTONE)
+                        found[key] = _TOMBSTONE
+                    else:
+                        pipe.setex(key, _jittered(ttl_seconds), value.model_dump_json())
+                        found[key] = value
+                    self._local.set(key, found[key])
+                await pipe.execute()
+
+        return {key: value for key, value in found.items() if value is not _TOMBSTONE}
+
+    async def set(
+        self, key: str, value: T, ttl_seconds: int, *, broadcast: bool = False
+    ) -> None:
+        """Store ``value`` in both tiers; ``broadcast`` evicts other processes' copies."""
+        if self._deferred is not None:
+            self._deferred.add(
+                lambda: self._store(key, value, ttl_seconds, broadcast=broadcast),
+                lambda: self._evict(key),
+            )
+            return
+        await self._store(key, value, ttl_seconds, broadcast=broadcast)
+
+    async def invalidate(self, key: str) -> None:
+        """Drop ``key`` from Redis and from the local tier of every process."""
+        if self._deferred is not None:
+            self._deferred.add(lambda: self._evict(key), lambda: self._evict(key))
+            return
+        await self._evict(key)
+
+    async def _store(
+        self, key: str, value: T, ttl_seconds: int, *, broadcast: bool = False
+    ) -> None:
+        await self._redis.setex(key, _jittered(ttl_seconds), value.model_dump_json())
+        self._local.set(key, value)
+        if broadcast:
+            await self._publish(key)
+
+    async def _evict(self, key: str) -> None:
+        await self._redis.delete(key)
+        self._local.delete(key)
+        await self._publish(key)
+
+    async def _fetch_remote(
+        self,
+        key: str,
+        loads: Callable[[str], T],
+        load: Callable[[], Awaitable[T | None]],
+        ttl_seconds: int,
+    ) -> Any:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.get(key)
+            pipe.pttl(key)
+            raw, remaining_ms = await pipe.execute()
+
+        if raw is not None:
+            self._stats.redis_hits += 1
+            value = _decode(raw, loads)
+            if not self._should_refresh_early(key, remaining_ms):
+                self._local.set(key, value)
+                return value
+            token = await self._acquire(key)
+            if token is None:
+                # Someone else is already refreshing; the current copy is valid.
+                self._local.set(key, value)
+                return value
+            return await self._load_and_store(key, load, ttl_seconds, token)
+
+        self._stats.redis_misses += 1
+        token = await self._acquire(key)
+        if token is None:
+            value = await self._wait_for(key, loads)
+            if value is not None:
+                return value
+        return await self._load_and_store(key, load, ttl_seconds, token)
+
+    async def _load_and_store(
+        self,
+        key: str,
+        load: Callable[[], Awaitable[T | None]],
+        ttl_seconds: int,
+        token: str | None,
+    ) -> Any:
+        started = time.perf_counter()
+        try:
+            value = await load()
+            _LOAD_SECONDS[_namespace(key)] = time.perf_counter() - started
+            if value is None:
+                await self._redis.setex(
+                    key, CACHE_TOMBSTONE_TTL_SECONDS, CACHE_TOMBSTONE
+                )
+                self._local.set(key, _TOMBSTONE)
+                return _TOMBSTONE
+            # Read-through fills are written at once; only write paths defer.
+            await self._store(key, value, ttl_seconds)
+            return value
+        finally:
+            if token is not None:
+                await self._release(key, token)
+
+    async def _acquire(self, key: str) -> str | None:
+        token = uuid4().hex
+        acquired = await self._redis.set(
+            _lock_key(key), token, nx=True, px=CACHE_LOCK_TTL_MS
+        )
+        return token if acquired else None
+
+    async def _release(self, key: str, token: str) -> None:
+        # Only drop our own lock; an expired one may already belong to another loader.
+        release = self._redis.register_script(RELEASE_LOCK_SCRIPT)
+        await release(keys=[_lock_key(key)], args=[token])
+
+    async def _wait_for(self, key: str, loads: Callable[[str], T]) -> Any:
+        """Poll Redis while another process rebuilds ``key``; ``None`` on timeout."""
+        deadline = time.monotonic() + CACHE_LOCK_WAIT_SECONDS
+        while time.monotonic() < deadline:
+            await asyncio.sleep(CACHE_LOCK_POLL_SECONDS)
+            raw = await self._redis.get(key)
+            if raw is not None:
+                value = _decode(raw, loads)
+                self._local.set(key, value)
+                return value
+        return None
+
+    @staticmethod
+    def _should_refresh_early(key: str, remaining_ms: int) -> bool:
+        """XFetch: refresh with a probability that grows as expiry approaches."""
+        if remaining_ms < 0:
+            return False
+        delta_ms = _LOAD_SECONDS.get(_namespace(key), 0.0) * 1000
+        return -delta_ms * CACHE_XFETCH_BETA * math.log(random.random()) >= remaining_ms
+
+    async def _publish(self, key: str) -> None:
+        await self._redis.publish(CACHE_INVALIDATION_CHANNEL, f"{PROCESS_TOKEN}|{key}")
+
+
+def _decode(raw: str, loads: Callable[[str], T]) -> Any:
+    return _TOMBSTONE if raw == CACHE_TOMBSTONE else loads(raw)
+
+
+def _jittered(ttl_seconds: int) -> int:
+    """Spread expiries of keys written together so they do not lapse at once."""
+    return max(1, round(ttl_seconds * (1 - random.random() * CACHE_TTL_JITTER)))
+
+
+def _lock_key(key: str) -> str:
+    return f"lock:{key}"
+
+
+def _namespace(key: str) -> str:
+    return key.partition(":")[0]
+
+
+async def listen_for_invalidations(
+    local: LocalCache = LOCAL_CACHE, retry_seconds: float = 1.0
+) -> None:
+    """Evict local entries invalidated by other processes until cancelled."""
+    # A dedicated client: the shared pool's socket timeout would abort the
+    # blocking read of an idle subscription.
+    client = Redis.from_url(REDIS_URL, decode_responses=True, health_check_interval=30)
     try:
-        yield client
+        while True:
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)
+                    # Messages published while disconnected are gone for good.
+                    local.clear()
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+                        sender, _, key = message["data"].partition("|")
+                        if sender != PROCESS_TOKEN:
+                            local.delete(key)
+            except RedisError:
+                logger.warning("Cache invalidation subscriber disconnected, retrying")
+                local.clear()
+                await asyncio.sleep(retry_seconds)
     finally:
         await client.aclose()
+
+
+def create_redis_client() -> Redis:
+    """Build a client over a bounded pool; no connection is opened until used."""
+    pool = BlockingConnectionPool.from_url(
+        REDIS_URL,
+        decode_responses=True,
+        max_connections=REDIS_MAX_CONNECTIONS,
+        timeout=REDIS_POOL_TIMEOUT_SECONDS,
+        socket_timeout=REDIS_SOCKET_TIMEOUT_SECONDS,
+    )
+    return Redis(connection_pool=pool)
+
+
+@asynccontextmanager
+async def redis_lifespan(app: Litestar) -> AsyncIterator[None]:
+    """Share one pooled Redis client for the lifetime of the application."""
+    client = create_redis_client()
+    app.state.redis = client
+    listener = asyncio.create_task(listen_for_invalidations())
+    try:
+        yield
+    finally:
+        listener.cancel()
+        with suppress(asyncio.CancelledError):
+            await listener
+        await client.aclose()
+        await client.connection_pool.disconnect()
+
+
+def get_redis_client(state: State) -> Redis:
+    """Return the process-wide Redis client created by ``redis_lifespan``."""
+    return state.redis
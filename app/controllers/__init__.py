@@ -1,5 +1,6 @@
 """Controllers package."""
 
+from .metrics_controller import MetricsController
 from .order_controller import OrderController
 from .product_controller import ProductController
 from .report_controller import ReportController
@@ -10,4 +11,5 @@ __all__ = [
     "ProductController",
     "OrderController",
     "ReportController",
+    "MetricsController",
 ]
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from litestar import Controller, get
+
+from app.cache import CACHE_STATS, LOCAL_CACHE
+from app.db import engine, pool_status
+from app.schemas import CacheMetrics, DatabasePoolMetrics
+
+
+class MetricsController(Controller):
+    path = "/metrics"
+
+    @get("/db")
+    async def get_db_metrics(self) -> DatabasePoolMetrics:
+        """Connection pool usage and checkout wait time of this process."""
+        return DatabasePoolMetrics(**pool_status(engine))
+
+    @get("/cache")
+    async def get_cache_metrics(self) -> CacheMetrics:
+        """Hit and miss counters of the in-process and Redis cache tiers."""
+        return CacheMetrics(**CACHE_STATS.snapshot(), local_entries=len(LOCAL_CACHE))
@@ -1,19 +1,24 @@
 from __future__ import annotations
 
+from typing import Annotated
 from uuid import UUID
 
-from litestar import Controller, get, put
-from litestar.exceptions import NotFoundException
-from litestar.params import Parameter
+from litestar import Controller, Response, get, post, put
+from litestar.exceptions import NotFoundException, ValidationException
+from litestar.params import Body, Parameter
+from litestar.status_codes import HTTP_200_OK
 
-from app.repositories import OrderNotFoundError
+from app.controllers.responses import json_response
+from app.repositories import InvalidCursorError, OrderNotFoundError
 from app.schemas import (
+    OrderBulkResponse,
+    OrderCreate,
     OrderListResponse,
     OrderResponse,
     OrderStatus,
     OrderStatusUpdate,
 )
-from app.services import OrderService
+from app.services import OrderService, resolve_total_mode
 
 
 class OrderController(Controller):
@@ -26,13 +31,36 @@ class OrderController(Controller):
         count: int = Parameter(default=10, ge=1, le=100),
         page: int = Parameter(default=1, ge=1),
         status: OrderStatus | None = Parameter(default=None),
-    ) -> OrderListResponse:
-        orders, total = await order_service.list_orders(
-            count=count, page=page, status=status
-        )
-        return OrderListResponse(
-            total=total,
-            items=[OrderResponse.model_validate(order) for order in orders],
+        cursor: str | None = Parameter(default=None),
+        include_total: bool = Parameter(default=True),
+        estimate_total: bool = Parameter(default=False),
+    ) -> Response[OrderListResponse]:
+        total_mode = resolve_total_mode(include_total, estimate_total)
+        try:
+            order_page = await order_service.list_orders(
+                count=count,
+                page=page,
+                status=status,
+                cursor=cursor,
+                total_mode=total_mode,
+            )
+        except InvalidCursorError as exc:
+            raise ValidationException(detail=str(exc)) from exc
+        return json_response(order_page)
+
+    @post("/bulk", status_code=HTTP_200_OK)
+    async def create_orders_bulk(
+        self,
+        order_service: OrderService,
+        data: Annotated[list[OrderCreate], Body(max_items=10000)],
+    ) -> OrderBulkResponse:
+        """Create many orders at once, reporting the outcome of each one."""
+        results = await order_service.create_orders_bulk(data)
+        created = sum(1 for result in results if result.order_id is not None)
+        return OrderBulkResponse(
+            created=created,
+            failed=len(results) - created,
+            results=results,
         )
 
     @get("/{order_id:uuid}")
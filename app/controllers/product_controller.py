@@ -2,12 +2,14 @@ from __future__ import annotations
 
 from uuid import UUID
 
-from litestar import Controller, get
-from litestar.exceptions import NotFoundException
+from litestar import Controller, Response, get
+from litestar.exceptions import NotFoundException, ValidationException
 from litestar.params import Parameter
 
-from app.schemas import ProductListResponse, ProductResponse
-from app.services import ProductService
+from app.controllers.responses import json_response
+from app.repositories import InvalidCursorError
+from app.schemas import ProductListResponse, ProductResponse, validate_many
+from app.services import ProductService, resolve_total_mode
 
 
 class ProductController(Controller):
@@ -19,12 +21,30 @@ class ProductController(Controller):
         product_service: ProductService,
         count: int = Parameter(default=10, ge=1, le=100),
         page: int = Parameter(default=1, ge=1),
-    ) -> ProductListResponse:
-        products, total = await product_service.list_products(count=count, page=page)
-        return ProductListResponse(
-            total=total,
-            items=[ProductResponse.model_validate(product) for product in products],
-        )
+        cursor: str | None = Parameter(default=None),
+        include_total: bool = Parameter(default=True),
+        estimate_total: bool = Parameter(default=False),
+        ids: list[UUID] | None = Parameter(
+            default=None,
+            max_items=100,
+            description="Fetch these products instead of a page; unknown ids are skipped.",
+        ),
+    ) -> Response[ProductListResponse]:
+        if ids:
+            products = await product_service.get_products_by_ids(ids)
+            return json_response(
+                ProductListResponse(
+                    total=len(products), items=validate_many(ProductResponse, products)
+                )
+            )
+        total_mode = resolve_total_mode(include_total, estimate_total)
+        try:
+            product_page = await product_service.list_products(
+                count=count, page=page, cursor=cursor, total_mode=total_mode
+            )
+        except InvalidCursorError as exc:
+            raise ValidationException(detail=str(exc)) from exc
+        return json_response(product_page)
 
     @get("/{product_id:uuid}")
     async def get_product(
@@ -3,12 +3,38 @@ from __future__ import annotations
 from datetime import date
 
 from litestar import Controller, get
+from litestar.exceptions import ValidationException
 from litestar.params import Parameter
 
-from app.schemas import OrderReportItem, OrderReportResponse
+from app.repositories import ReportPeriod
+from app.schemas import (
+    OrderReportItem,
+    OrderReportResponse,
+    OrderReportRollupItem,
+    OrderReportRollupResponse,
+    OrderReportTopResponse,
+    validate_many,
+)
 from app.services import OrderReportService
 
 
+def _resolve_range(
+    report_at: date | None, date_from: date | None, date_to: date | None
+) -> tuple[date, date]:
+    """Accept either a single ``report_at`` day or an inclusive from/to range."""
+    if report_at is not None:
+        if date_from is not None or date_to is not None:
+            raise ValidationException(
+                detail="Pass either report_at or from and to, not both"
+            )
+        return report_at, report_at
+    if date_from is None or date_to is None:
+        raise ValidationException(detail="Pass either report_at or both from and to")
+    if date_from > date_to:
+        raise ValidationException(detail="from must not be later than to")
+    return date_from, date_to
+
+
 class ReportController(Controller):
     path = "/report"
 
@@ -16,13 +42,66 @@ class ReportController(Controller):
     async def get_report(
         self,
         order_report_service: OrderReportService,
-        report_at: date = Parameter(
-            title="Report date", description="Day to fetch order report for."
+        report_at: date | None = Parameter(
+            default=None,
+            title="Report date",
+            description="Day to fetch order report for.",
         ),
+        date_from: date | None = Parameter(query="from", default=None),
+        date_to: date | None = Parameter(query="to", default=None),
+        count: int = Parameter(default=1000, ge=1, le=10000),
+        page: int = Parameter(default=1, ge=1),
     ) -> OrderReportResponse:
-        entries = await order_report_service.get_report(report_at)
+        """Report rows for a day or a range, ``count`` rows (1000 by default) a page.
+
+        A day with more rows than ``count`` is not returned whole: ``total`` is
+        the number of rows in the range and ``has_more`` is set while further
+        pages remain.
+        """
+        date_from, date_to = _resolve_range(report_at, date_from, date_to)
+        entries, total = await order_report_service.get_report_range(
+            date_from, date_to, count=count, page=page
+        )
         return OrderReportResponse(
             report_at=report_at,
-            total=len(entries),
-            items=[OrderReportItem.model_validate(entry) for entry in entries],
+            date_from=date_from,
+            date_to=date_to,
+            total=total,
+            has_more=page * count < total,
+            items=validate_many(OrderReportItem, entries),
+        )
+
+    @get("/rollup")
+    async def get_rollup(
+        self,
+        order_report_service: OrderReportService,
+        date_from: date = Parameter(query="from"),
+        date_to: date = Parameter(query="to"),
+        period: ReportPeriod = Parameter(default="day"),
+    ) -> OrderReportRollupResponse:
+        """Per day, week or month totals computed by the database."""
+        date_from, date_to = _resolve_range(None, date_from, date_to)
+        rows = await order_report_service.get_rollup(date_from, date_to, period)
+        return OrderReportRollupResponse(
+            period=period,
+            date_from=date_from,
+            date_to=date_to,
+            items=validate_many(OrderReportRollupItem, rows),
+        )
+
+    @get("/top")
+    async def get_top_orders(
+        self,
+        order_report_service: OrderReportService,
+        date_from: date = Parameter(query="from"),
+        date_to: date = Parameter(query="to"),
+        limit: int = Parameter(default=10, ge=1, le=1000),
+    ) -> OrderReportTopResponse:
+        """Orders with the largest number of products within the range."""
+        date_from, date_to = _resolve_range(None, date_from, date_to)
+        entries = await order_report_service.get_top_orders(date_from, date_to, limit)
+        return OrderReportTopResponse(
+            date_from=date_from,
+            date_to=date_to,
+            items=validate_many(OrderReportItem, entries),
         )
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from typing import TypeVar
+
+from litestar import MediaType, Response
+from pydantic import BaseModel
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def json_response(payload: M) -> Response[M]:
+    """Encode ``payload`` with pydantic-core directly.
+
+    Returning the model would make Litestar dump it to Python objects and encode
+    those again; large list pages skip that second pass.
+    """
+    return Response(content=payload.model_dump_json(), media_type=MediaType.JSON)
@@ -3,14 +3,21 @@ from __future__ import annotations
 from typing import Annotated
 from uuid import UUID
 
-from litestar import Controller, delete, get, post, put
-from litestar.exceptions import NotFoundException
+from litestar import Controller, Response, delete, get, post, put
+from litestar.exceptions import NotFoundException, ValidationException
 from litestar.params import Body, Parameter
 from litestar.status_codes import HTTP_201_CREATED, HTTP_204_NO_CONTENT
 
-from app.repositories import UserNotFoundError
-from app.schemas import UserCreate, UserListResponse, UserResponse, UserUpdate
-from app.services import UserService
+from app.controllers.responses import json_response
+from app.repositories import InvalidCursorError, UserNotFoundError, next_cursor
+from app.schemas import (
+    UserCreate,
+    UserListResponse,
+    UserResponse,
+    UserUpdate,
+    validate_many,
+)
+from app.services import UserService, resolve_total_mode
 
 
 class UserController(Controller):
@@ -34,12 +41,37 @@ class UserController(Controller):
         user_service: UserService,
         count: int = Parameter(default=10, ge=1, le=100),
         page: int = Parameter(default=1, ge=1),
-    ) -> UserListResponse:
-        """Return paginated users with total count."""
-        users, total = await user_service.get_users(count=count, page=page)
-        return UserListResponse(
-            total=total,
-            items=[UserResponse.model_validate(user) for user in users],
+        cursor: str | None = Parameter(default=None),
+        include_total: bool = Parameter(default=True),
+        estimate_total: bool = Parameter(default=False),
+        ids: list[UUID] | None = Parameter(
+            default=None,
+            max_items=100,
+            description="Fetch these users instead of a page; unknown ids are skipped.",
+        ),
+    ) -> Response[UserListResponse]:
+        """Return users page by page, after a cursor, or by a list of ids."""
+        if ids:
+            users = await user_service.get_users_by_ids(ids)
+            return json_response(
+                UserListResponse(
+                    total=len(users), items=validate_many(UserResponse, users)
+                )
+            )
+        total_mode = resolve_total_mode(include_total, estimate_total)
+        try:
+            users, total, estimated = await user_service.get_users(
+                count=count, page=page, cursor=cursor, total_mode=total_mode
+            )
+        except InvalidCursorError as exc:
+            raise ValidationException(detail=str(exc)) from exc
+        return json_response(
+            UserListResponse(
+                total=total,
+                total_estimated=estimated,
+                items=validate_many(UserResponse, users),
+                next_cursor=next_cursor(users, count),
+            )
         )
 
     @post(status_code=HTTP_201_CREATED)
@@ -1,14 +1,130 @@
 from __future__ import annotations
 
 import os
+import time
 from collections.abc import AsyncIterator
+from typing import Any
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 # Async database configuration shared between the API and background consumers.
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql+asyncpg://ad:ad@127.0.0.1:5432/ad")
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+# Engine defaults per environment; every value can be overridden by a DB_* variable.
+DB_PROFILES: dict[str, dict[str, Any]] = {
+    "development": {
+        "echo": True,
+        "pool_size": 5,
+        "max_overflow": 5,
+        "pool_timeout": 30.0,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "statement_cache_size": 100,
+        "statement_timeout_ms": 0,
+    },
+    "production": {
+        "echo": False,
+        "pool_size": 20,
+        "max_overflow": 10,
+        "pool_timeout": 5.0,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "statement_cache_size": 500,
+        "statement_timeout_ms": 15000,
+    },
+}
+DB_PROFILE = os.getenv("DB_PROFILE", "production")
+
+
+class PoolMetrics:
+    """Counters describing how long requests wait for a pooled connection."""
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.wait_seconds_total += seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+
+POOL_METRICS = PoolMetrics()
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records the time spent waiting for each checkout."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_METRICS.record_wait(time.perf_counter() - started)
+
+
+def load_db_settings(profile: str = DB_PROFILE) -> dict[str, Any]:
+    """Merge the named profile with DB_* environment overrides."""
+    if profile not in DB_PROFILES:
+        raise ValueError(f"Unknown DB_PROFILE {profile!r}")
+    settings = dict(DB_PROFILES[profile])
+    for name, default in settings.items():
+        raw = os.getenv(f"DB_{name.upper()}")
+        if raw is None:
+            continue
+        if isinstance(default, bool):
+            settings[name] = raw.lower() in {"1", "true", "yes"}
+        else:
+            settings[name] = type(default)(raw)
+    return settings
+
+
+def create_engine_from_settings(
+    url: str = DATABASE_URL, profile: str = DB_PROFILE
+) -> AsyncEngine:
+    """Create the async engine with pool sizing and driver options from settings."""
+    settings = load_db_settings(profile)
+    connect_args: dict[str, Any] = {}
+    if url.startswith("postgresql+asyncpg"):
+        connect_args["prepared_statement_cache_size"] = settings["statement_cache_size"]
+        if settings["statement_timeout_ms"]:
+            connect_args["server_settings"] = {
+                "statement_timeout": str(settings["statement_timeout_ms"])
+            }
+    return create_async_engine(
+        url,
+        echo=settings["echo"],
+        poolclass=InstrumentedPool,
+        pool_size=settings["pool_size"],
+        max_overflow=settings["max_overflow"],
+        pool_timeout=settings["pool_timeout"],
+        pool_recycle=settings["pool_recycle"],
+        pool_pre_ping=settings["pool_pre_ping"],
+        connect_args=connect_args,
+    )
+
+
+def pool_status(target: AsyncEngine) -> dict[str, Any]:
+    """Snapshot of pool usage for the metrics endpoint."""
+    pool = target.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "checkouts": POOL_METRICS.checkouts,
+        "wait_seconds_total": POOL_METRICS.wait_seconds_total,
+        "wait_seconds_max": POOL_METRICS.wait_seconds_max,
+    }
+
+
+engine = create_engine_from_settings()
 async_session_factory = async_sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
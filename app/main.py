@@ -3,12 +3,14 @@ from __future__ import annotations
 from collections.abc import AsyncIterator
 
 from litestar import Litestar
+from litestar.datastructures import State
 from litestar.di import Provide
 from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.cache import get_redis_client
+from app.cache import get_redis_client, redis_lifespan
 from app.controllers import (
+    MetricsController,
     OrderController,
     ProductController,
     ReportController,
@@ -36,10 +38,9 @@ async def provide_db_session() -> AsyncIterator[AsyncSession]:
         yield session
 
 
-async def provide_redis_client() -> AsyncIterator[Redis]:
-    """Провайдер соединения с Redis."""
-    async for client in get_redis_client():
-        yield client
+async def provide_redis_client(state: State) -> Redis:
+    """Провайдер общего клиента Redis (соединение берётся из пула при запросе)."""
+    return get_redis_client(state)
 
 
 async def provide_user_repository(db_session: AsyncSession) -> UserRepository:
@@ -88,6 +89,7 @@ async def provide_order_service(
     product_repository: ProductRepository,
     user_repository: UserRepository,
     address_repository: AddressRepository,
+    redis_client: Redis,
 ) -> OrderService:
     """Провайдер сервиса заказов."""
     return OrderService(
@@ -95,6 +97,7 @@ async def provide_order_service(
         product_repository,
         user_repository,
         address_repository,
+        redis_client,
     )
 
 
@@ -111,7 +114,9 @@ app = Litestar(
         ProductController,
         OrderController,
         ReportController,
+        MetricsController,
     ],
+    lifespan=[redis_lifespan],
     dependencies={
         "db_session": Provide(provide_db_session),
         "redis_client": Provide(provide_redis_client),
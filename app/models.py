@@ -1,16 +1,44 @@
 from datetime import date, datetime
 from uuid import UUID, uuid4
 
-from sqlalchemy import Date, ForeignKey
+from sqlalchemy import Date, DateTime, ForeignKey, Index
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from sqlalchemy.sql.expression import FunctionElement
 
 
 class Base(DeclarativeBase):
     pass
 
 
+# pylint: disable-next=invalid-name,too-many-ancestors,abstract-method
+class db_now(FunctionElement):
+    """Wall-clock time of the database server as a naive local timestamp."""
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(db_now)
+def _db_now(element, compiler, **kw):  # pylint: disable=unused-argument
+    return "LOCALTIMESTAMP"
+
+
+@compiles(db_now, "postgresql")
+def _db_now_postgresql(element, compiler, **kw):  # pylint: disable=unused-argument
+    # clock_timestamp() rather than now(): the time of the statement, not of the
+    # start of its transaction, so a long batch does not stamp rows in the past.
+    return "CAST(clock_timestamp() AS TIMESTAMP WITHOUT TIME ZONE)"
+
+
+@compiles(db_now, "sqlite")
+def _db_now_sqlite(element, compiler, **kw):  # pylint: disable=unused-argument
+    return "strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')"
+
+
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (Index("ix_users_created_at_id", "created_at", "id"),)
 
     id: Mapped[UUID] = mapped_column(
         primary_key=True,
@@ -30,6 +58,17 @@ class User(Base):
 
 class Address(Base):
     __tablename__ = "addresses"
+    __table_args__ = (
+        Index(
+            "ix_addresses_user_id_lookup",
+            "user_id",
+            "street",
+            "city",
+            "state",
+            "zip_code",
+            "country",
+        ),
+    )
 
     id: Mapped[UUID] = mapped_column(
         primary_key=True,
@@ -54,6 +93,10 @@ class Address(Base):
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        Index("ix_products_created_at_id", "created_at", "id"),
+        Index("ix_products_name_created_at", "name", "created_at"),
+    )
 
     id: Mapped[UUID] = mapped_column(
         primary_key=True,
@@ -73,6 +116,14 @@ class Product(Base):
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        Index("ix_orders_created_at_id", "created_at", "id"),
+        Index("ix_orders_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_orders_user_id", "user_id"),
+        Index("ix_orders_updated_at_id", "updated_at", "id"),
+    )
+    # updated_at is generated by the database; read it back in the same round trip.
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[UUID] = mapped_column(
         primary_key=True,
@@ -86,9 +137,9 @@ class Order(Base):
     )  # pending, completed, cancelled
 
     created_at: Mapped[datetime] = mapped_column(default=datetime.now)
-    updated_at: Mapped[datetime] = mapped_column(
-        default=datetime.now, onupdate=datetime.now
-    )
+    # Stamped by the database clock: the incremental report compares it with
+    # that clock, so application hosts with skewed clocks cannot skip orders.
+    updated_at: Mapped[datetime] = mapped_column(default=db_now(), onupdate=db_now())
 
     user = relationship("User", back_populates="orders")
     address = relationship("Address", back_populates="orders")
@@ -100,6 +151,10 @@ class Order(Base):
 
 class OrderItem(Base):
     __tablename__ = "order_items"
+    __table_args__ = (
+        Index("ix_order_items_order_id", "order_id"),
+        Index("ix_order_items_product_id", "product_id"),
+    )
 
     id: Mapped[UUID] = mapped_column(
         primary_key=True,
@@ -127,3 +182,25 @@ class OrderReport(Base):
     count_product: Mapped[int] = mapped_column(nullable=False)
 
     order = relationship("Order", back_populates="reports")
+
+
+class ReportWatermark(Base):
+    """Last order change already folded into a report, by report name."""
+
+    __tablename__ = "report_watermarks"
+
+    name: Mapped[str] = mapped_column(primary_key=True)
+    updated_at: Mapped[datetime] = mapped_column(nullable=False)
+    order_id: Mapped[UUID] = mapped_column(nullable=False)
+
+
+class ProcessedMessage(Base):
+    """Queue message already applied, by queue and idempotency key."""
+
+    __tablename__ = "processed_messages"
+    __table_args__ = (Index("ix_processed_messages_processed_at", "processed_at"),)
+
+    queue: Mapped[str] = mapped_column(primary_key=True)
+    message_id: Mapped[str] = mapped_column(primary_key=True)
+    result_id: Mapped[UUID | None] = mapped_column(nullable=True)
+    processed_at: Mapped[datetime] = mapped_column(default=datetime.now)
@@ -1,9 +1,15 @@
 """Repository layer initialization."""
 
 from .address_repository import AddressRepository
-from .order_report_repository import OrderReportRepository
+from .order_report_repository import OrderReportRepository, ReportPeriod
 from .order_repository import OrderNotFoundError, OrderRepository
-from .product_repository import ProductNotFoundError, ProductRepository
+from .pagination import InvalidCursorError, next_cursor
+from .processed_message_repository import ProcessedMessageRepository
+from .product_repository import (
+    InsufficientStockError,
+    ProductNotFoundError,
+    ProductRepository,
+)
 from .user_repository import UserNotFoundError, UserRepository
 
 __all__ = [
@@ -11,8 +17,13 @@ __all__ = [
     "UserNotFoundError",
     "ProductRepository",
     "ProductNotFoundError",
+    "InsufficientStockError",
     "OrderRepository",
     "OrderNotFoundError",
     "AddressRepository",
     "OrderReportRepository",
+    "ReportPeriod",
+    "ProcessedMessageRepository",
+    "InvalidCursorError",
+    "next_cursor",
 ]
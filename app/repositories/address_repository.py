@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+from typing import Any, Iterable
 from uuid import UUID
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Address
+from app.repositories.pagination import matches_any
 
 
 class AddressRepository:
@@ -17,6 +19,22 @@ class AddressRepository:
     async def get_by_id(self, address_id: UUID) -> Address | None:
         return await self._session.get(Address, address_id)
 
+    async def get_many_by_ids(self, address_ids: Iterable[UUID]) -> dict[UUID, Address]:
+        ids = set(address_ids)
+        if not ids:
+            return {}
+        stmt = select(Address).where(matches_any(self._session, Address.id, ids))
+        result = await self._session.execute(stmt)
+        return {address.id: address for address in result.scalars().all()}
+
+    async def get_by_user_ids(self, user_ids: Iterable[UUID]) -> list[Address]:
+        ids = set(user_ids)
+        if not ids:
+            return []
+        stmt = select(Address).where(matches_any(self._session, Address.user_id, ids))
+        result = await self._session.execute(stmt)
+        return list(result.scalars().all())
+
     async def find_existing(
         self,
         *,
@@ -48,6 +66,7 @@ class AddressRepository:
         zip_code: str,
         country: str,
         is_primary: bool = False,
+        commit: bool = True,
     ) -> Address:
         address = Address(
             user_id=user_id,
@@ -59,6 +78,17 @@ class AddressRepository:
             is_primary=is_primary,
         )
         self._session.add(address)
+        if not commit:
+            await self._session.flush()
+            return address
+
         await self._session.commit()
         await self._session.refresh(address)
         return address
+
+    async def create_many(self, payloads: list[dict[str, Any]]) -> list[Address]:
+        """Flush several new addresses without committing."""
+        addresses = [Address(**payload) for payload in payloads]
+        self._session.add_all(addresses)
+        await self._session.flush()
+        return addresses
@@ -1,12 +1,23 @@
 from __future__ import annotations
 
-from datetime import date
+import os
+from datetime import date, datetime, time, timedelta
+from typing import Any, Literal, Sequence
 
-from sqlalchemy import func, select
+from sqlalchemy import Date, cast, func, select, tuple_
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Order, OrderItem, OrderReport
+from app.models import Order, OrderItem, OrderReport, ReportWatermark, db_now
+
+ORDER_REPORT_WATERMARK = "order_reports"
+# An order is stamped when its statement runs but becomes visible only when its
+# transaction commits. The lag must exceed the longest such transaction: a
+# consumer batch or a bulk chunk runs many statements under one COMMIT, each up
+# to the 15 s statement_timeout of the production profile.
+ORDER_REPORT_LAG_SECONDS = float(os.getenv("ORDER_REPORT_LAG_SECONDS", "120"))
+
+ReportPeriod = Literal["day", "week", "month"]
 
 
 class OrderReportRepository:
@@ -24,15 +35,69 @@ class OrderReportRepository:
         result = await self._session.execute(stmt)
         return result.scalars().all()
 
+    async def get_range(
+        self, date_from: date, date_to: date, *, count: int, page: int = 1
+    ) -> tuple[list[OrderReport], int]:
+        """Return one page of report rows for an inclusive date range."""
+        in_range = OrderReport.report_at.between(date_from, date_to)
+        stmt = (
+            select(OrderReport)
+            .where(in_range)
+            .order_by(OrderReport.report_at, OrderReport.order_id)
+            .limit(count)
+            .offset((page - 1) * count)
+        )
+        result = await self._session.execute(stmt)
+        total = await self._session.scalar(
+            select(func.count()).select_from(OrderReport).where(in_range)
+        )
+        return result.scalars().all(), int(total or 0)
+
+    async def rollup(
+        self, date_from: date, date_to: date, period: ReportPeriod
+    ) -> list[Any]:
+        """Aggregate orders and ordered products per day, week or month."""
+        bucket = self._period_start(period).label("period_start")
+        stmt = (
+            select(
+                bucket,
+                func.count(OrderReport.order_id).label("orders"),
+                func.sum(OrderReport.count_product).label("count_product"),
+            )
+            .where(OrderReport.report_at.between(date_from, date_to))
+            .group_by(bucket)
+            .order_by(bucket)
+        )
+        result = await self._session.execute(stmt)
+        return result.all()
+
+    async def top_orders(
+        self, date_from: date, date_to: date, limit: int
+    ) -> list[OrderReport]:
+        """Return the orders with the most products within the range."""
+        stmt = (
+            select(OrderReport)
+            .where(OrderReport.report_at.between(date_from, date_to))
+            .order_by(OrderReport.count_product.desc(), OrderReport.order_id)
+            .limit(limit)
+        )
+        result = await self._session.execute(stmt)
+        return result.scalars().all()
+
     async def upsert_for_date(self, report_at: date) -> list[OrderReport]:
+        # A half-open range on the bare column lets the planner use the
+        # created_at index instead of evaluating date() for every order.
+        day_start = datetime.combine(report_at, time.min)
         aggregates = await self._session.execute(
             select(
-                func.date(Order.created_at).label("report_at"),
                 Order.id.label("order_id"),
                 func.coalesce(func.sum(OrderItem.quantity), 0).label("count_product"),
             )
             .join(OrderItem, Order.items)
-            .where(func.date(Order.created_at) == report_at)
+            .where(
+                Order.created_at >= day_start,
+                Order.created_at < day_start + timedelta(days=1),
+            )
             .group_by(Order.id)
         )
         rows = aggregates.all()
@@ -41,18 +106,101 @@ class OrderReportRepository:
 
         payload = [
             {
-                "report_at": row.report_at,
+                "report_at": report_at,
                 "order_id": row.order_id,
                 "count_product": int(row.count_product),
             }
             for row in rows
         ]
+        result = await self._session.execute(
+            self._upsert_statement(payload).returning(OrderReport)
+        )
+        await self._session.commit()
+        return result.scalars().all()
+
+    async def upsert_counts(self, payload: Sequence[dict[str, Any]]) -> None:
+        """Write ``report_at``/``order_id``/``count_product`` rows without committing."""
+        if payload:
+            await self._session.execute(self._upsert_statement(payload))
+
+    async def refresh_changed(
+        self,
+        *,
+        batch_size: int = 5000,
+        lag: timedelta = timedelta(seconds=ORDER_REPORT_LAG_SECONDS),
+    ) -> int:
+        """Re-aggregate only orders changed since the last run.
+
+        Orders are walked in ``(updated_at, id)`` order from the stored
+        watermark, one committed batch at a time. Changes younger than ``lag``
+        (by the database clock, which also stamps ``updated_at``) are left for
+        the next run so that slower, still open transactions with earlier
+        timestamps are not skipped. Returns the number of orders seen.
+        """
+        watermark = await self._session.get(ReportWatermark, ORDER_REPORT_WATERMARK)
+        horizon = await self._session.scalar(select(db_now())) - lag
+        processed = 0
+        while True:
+            stmt = select(Order.id, Order.created_at, Order.updated_at).where(
+                Order.updated_at < horizon
+            )
+            if watermark is not None:
+                stmt = stmt.where(
+                    tuple_(Order.updated_at, Order.id)
+                    > (watermark.updated_at, watermark.order_id)
+                )
+            result = await self._session.execute(
+                stmt.order_by(Order.updated_at, Order.id).limit(batch_size)
+            )
+            changed = result.all()
+            if not changed:
+                return processed
 
-        insert_stmt = insert(OrderReport).values(payload)
-        upsert_stmt = insert_stmt.on_conflict_do_update(
+            counts = await self._session.execute(
+                select(OrderItem.order_id, func.sum(OrderItem.quantity))
+                .where(OrderItem.order_id.in_([row.id for row in changed]))
+                .group_by(OrderItem.order_id)
+            )
+            count_by_order = dict(counts.tuples().all())
+            await self.upsert_counts(
+                [
+                    {
+                        "report_at": row.created_at.date(),
+                        "order_id": row.id,
+                        "count_product": int(count_by_order[row.id]),
+                    }
+                    for row in changed
+                    if row.id in count_by_order
+                ]
+            )
+
+            last = changed[-1]
+            if watermark is None:
+                watermark = ReportWatermark(name=ORDER_REPORT_WATERMARK)
+                self._session.add(watermark)
+            watermark.updated_at = last.updated_at
+            watermark.order_id = last.id
+            await self._session.commit()
+
+            processed += len(changed)
+            if len(changed) < batch_size:
+                return processed
+
+    def _period_start(self, period: ReportPeriod) -> Any:
+        column = OrderReport.report_at
+        if period == "day":
+            return column
+        if self._session.get_bind().dialect.name == "postgresql":
+            return cast(func.date_trunc(period, column), Date)
+        # SQLite fallback used by the test suite: weeks start on Monday.
+        if period == "week":
+            return func.date(column, "weekday 0", "-6 days")
+        return func.strftime("%Y-%m-01", column)
+
+    @staticmethod
+    def _upsert_statement(payload: Sequence[dict[str, Any]]):
+        insert_stmt = insert(OrderReport).values(list(payload))
+        return insert_stmt.on_conflict_do_update(
             index_elements=[OrderReport.report_at, OrderReport.order_id],
             set_={"count_product": insert_stmt.excluded.count_product},
-        ).returning(OrderReport)
-        result = await self._session.execute(upsert_stmt)
-        await self._session.commit()
-        return result.scalars().all()
+        )
@@ -1,13 +1,37 @@
 from __future__ import annotations
 
-from typing import Any, Sequence
+import os
+from datetime import datetime
+from typing import Any, Iterable, Sequence
 from uuid import UUID
 
-from sqlalchemy import Select, func, select
+from sqlalchemy import Result, Row, RowMapping, Select, func, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.models import Order, OrderItem
+from app.repositories.order_report_repository import OrderReportRepository
+from app.repositories.pagination import estimate_row_count, matches_any, paginate
+
+# Keep order_reports current inside order writes instead of via the scheduler.
+MAINTAIN_ORDER_REPORTS = os.getenv("ORDER_REPORTS_INLINE", "0") == "1"
+
+
+# Columns read by the read-only list paths; what OrderResponse and cursors need.
+ORDER_COLUMNS = (
+    Order.id,
+    Order.user_id,
+    Order.address_id,
+    Order.status,
+    Order.total_price,
+    Order.created_at,
+)
+ORDER_ITEM_COLUMNS = (
+    OrderItem.order_id,
+    OrderItem.product_id,
+    OrderItem.quantity,
+    OrderItem.unit_price,
+)
 
 
 class OrderNotFoundError(LookupError):
@@ -17,8 +41,11 @@ class OrderNotFoundError(LookupError):
 class OrderRepository:
     """Async repository managing orders and their items."""
 
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(
+        self, session: AsyncSession, maintain_reports: bool = MAINTAIN_ORDER_REPORTS
+    ) -> None:
         self._session = session
+        self._maintain_reports = maintain_reports
 
     async def get_by_id(self, order_id: UUID) -> Order | None:
         stmt = (
@@ -27,29 +54,67 @@ class OrderRepository:
         result = await self._session.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def get_rows_by_ids(
+        self, order_ids: Iterable[UUID]
+    ) -> dict[UUID, dict[str, Any]]:
+        """Read-only order rows with their item rows keyed by id.
+
+        Only the columns of ``OrderResponse`` are selected and nothing enters the
+        identity map; unknown ids are skipped.
+        """
+        ids = set(order_ids)
+        if not ids:
+            return {}
+        stmt = select(*ORDER_COLUMNS).where(matches_any(self._session, Order.id, ids))
+        with self._session.no_autoflush:
+            result = await self._session.execute(stmt)
+            orders = await self._with_item_rows(result.mappings().all())
+        return {order["id"]: order for order in orders}
+
     async def get_by_filter(
         self,
         count: int = 10,
         page: int = 1,
+        cursor: str | None = None,
+        with_total: bool = True,
         **filters: Any,
-    ) -> tuple[list[Order], int]:
-        query = self._apply_filters(select(Order), filters).options(
-            selectinload(Order.items)
-        )
-        total_query = self._apply_filters(
-            select(func.count()).select_from(Order), filters
+    ) -> tuple[list[Order], int | None]:
+        query = select(Order).options(selectinload(Order.items))
+        result, total = await self._page(
+            query, filters, count, page, cursor, with_total
         )
+        return result.scalars().all(), total
 
-        limited_query = (
-            query.order_by(Order.created_at.desc())
-            .limit(count)
-            .offset((page - 1) * count)
-        )
-        result = await self._session.execute(limited_query)
-        orders = result.scalars().all()
+    async def get_rows_by_filter(
+        self,
+        count: int = 10,
+        page: int = 1,
+        cursor: str | None = None,
+        with_total: bool = True,
+        **filters: Any,
+    ) -> tuple[list[dict[str, Any]], int | None]:
+        """Read-only variant of ``get_by_filter`` returning plain column rows."""
+        with self._session.no_autoflush:
+            result, total = await self._page(
+                select(*ORDER_COLUMNS), filters, count, page, cursor, with_total
+            )
+            orders = await self._with_item_rows(result.mappings().all())
+        return orders, total
 
-        total = await self._session.scalar(total_query)
-        return orders, int(total or 0)
+    async def get_ids_by_filter(
+        self,
+        count: int = 10,
+        page: int = 1,
+        cursor: str | None = None,
+        with_total: bool = True,
+        **filters: Any,
+    ) -> tuple[list[Row[Any]], int | None]:
+        """Page through ``(id, created_at)`` rows; the orders come from elsewhere."""
+        query = select(Order.id, Order.created_at)
+        result, total = await self._page(
+            query, filters, count, page, cursor, with_total
+        )
+        return result.all(), total
 
     async def create(
         self,
@@ -58,6 +123,7 @@ class OrderRepository:
         address_id: UUID,
         items: Sequence[dict[str, Any]],
         status: str = "pending",
+        commit: bool = True,
     ) -> Order:
         if not items:
             raise ValueError("Order must contain at least one item")
@@ -80,9 +146,77 @@ class OrderRepository:
         order.total_price = sum(item.quantity * item.unit_price for item in order.items)
         self._session.add(order)
         await self._session.flush()
-        order_id = order.id
-        await self._session.commit()
-        return await self.get_or_raise(order_id)
+        await self._report_orders([order])
+        if commit:
+            await self._session.commit()
+        # The freshly built order already holds its items; no need to re-select it.
+        return order
+
+    async def create_many(
+        self,
+        orders: Sequence[dict[str, Any]],
+        *,
+        commit: bool = True,
+    ) -> list[UUID]:
+        """Insert many orders with their items using multi-row INSERT statements.
+
+        Every payload carries ``user_id``, ``address_id``, ``status`` and ``items``
+        shaped like the ``create`` arguments. Returns new order ids in input order.
+        """
+        if not orders:
+            return []
+
+        now = datetime.now()
+        order_rows = [
+            {
+                "created_at": now,
+                "user_id": payload["user_id"],
+                "address_id": payload["address_id"],
+                "status": payload.get("status", "pending"),
+                "total_price": sum(
+                    item["quantity"] * item["unit_price"] for item in payload["items"]
+                ),
+            }
+            for payload in orders
+        ]
+        result = await self._session.execute(
+            insert(Order).returning(Order.id, sort_by_parameter_order=True),
+            order_rows,
+        )
+        order_ids = list(result.scalars().all())
+
+        item_rows = [
+            {
+                "order_id": order_id,
+                "product_id": item["product_id"],
+                "quantity": item["quantity"],
+                "unit_price": item["unit_price"],
+            }
+            for order_id, payload in zip(order_ids, orders)
+            for item in payload["items"]
+        ]
+        await self._session.execute(insert(OrderItem), item_rows)
+
+        if self._maintain_reports:
+            await OrderReportRepository(self._session).upsert_counts(
+                [
+                    {
+                        "report_at": now.date(),
+                        "order_id": order_id,
+                        "count_product": sum(
+                            item["quantity"] for item in payload["items"]
+                        ),
+                    }
+                    for order_id, payload in zip(order_ids, orders)
+                ]
+            )
+        if commit:
+            await self._session.commit()
+        return order_ids
+
+    async def rollback(self) -> None:
+        """Discard everything pending in the current transaction."""
+        await self._session.rollback()
 
     async def update(
         self,
@@ -109,6 +243,8 @@ class OrderRepository:
             order.total_price = sum(
                 item.quantity * item.unit_price for item in order.items
             )
+            await self._session.flush()
+            await self._report_orders([order])
 
         await self._session.commit()
         return await self.get_or_raise(order.id)
@@ -124,6 +260,65 @@ class OrderRepository:
             raise OrderNotFoundError(f"Order {order_id} not found")
         return order
 
+    async def estimate_count(self) -> int | None:
+        """Approximate the unfiltered row count without scanning the table."""
+        return await estimate_row_count(self._session, Order)
+
+    async def _report_orders(self, orders: Sequence[Order]) -> None:
+        if not self._maintain_reports:
+            return
+        await OrderReportRepository(self._session).upsert_counts(
+            [
+                {
+                    "report_at": order.created_at.date(),
+                    "order_id": order.id,
+                    "count_product": sum(item.quantity for item in order.items),
+                }
+                for order in orders
+            ]
+        )
+
+    async def _with_item_rows(
+        self, order_rows: Sequence[RowMapping]
+    ) -> list[dict[str, Any]]:
+        """Attach item rows to each order row with one query over all orders."""
+        orders = [dict(row, items=[]) for row in order_rows]
+        if not orders:
+            return orders
+        by_id = {order["id"]: order["items"] for order in orders}
+        stmt = select(*ORDER_ITEM_COLUMNS).where(
+            matches_any(self._session, OrderItem.order_id, list(by_id))
+        )
+        result = await self._session.execute(stmt)
+        for item in result.mappings():
+            by_id[item["order_id"]].append(item)
+        return orders
+
+    async def _page(
+        self,
+        query: Select[Any],
+        filters: dict[str, Any],
+        count: int,
+        page: int,
+        cursor: str | None,
+        with_total: bool,
+    ) -> tuple[Result[Any], int | None]:
+        limited_query = paginate(
+            self._apply_filters(query, filters),
+            Order,
+            count=count,
+            page=page,
+            cursor=cursor,
+        )
+        result = await self._session.execute(limited_query)
+        if not with_total:
+            return result, None
+        total_query = self._apply_filters(
+            select(func.count()).select_from(Order), filters
+        )
+        total = await self._session.scalar(total_query)
+        return result, int(total or 0)
+
     @staticmethod
     def _apply_filters(query: Select[Any], filters: dict[str, Any]) -> Select[Any]:
         for field, value in filters.items():
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, Mapping, Sequence
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, Select, any_, literal, text, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    """Build an opaque cursor pointing right after the given row."""
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursorError(f"Invalid cursor: {cursor!r}") from exc
+
+
+def next_cursor(rows: Sequence[Any], count: int) -> str | None:
+    """Return the cursor for the page after ``rows`` or None on the last page."""
+    if len(rows) < count or not rows:
+        return None
+    last = rows[-1]
+    if isinstance(last, Mapping):
+        return encode_cursor(last["created_at"], last["id"])
+    return encode_cursor(last.created_at, last.id)
+
+
+def paginate(
+    query: Select[Any],
+    model: Any,
+    *,
+    count: int,
+    page: int = 1,
+    cursor: str | None = None,
+) -> Select[Any]:
+    """Order newest first and apply either a keyset predicate or an offset.
+
+    The ``(created_at, id)`` keyset is served by a composite index, so a cursor
+    costs the same on any page, while ``page`` keeps the old offset behaviour.
+    """
+    query = query.order_by(model.created_at.desc(), model.id.desc()).limit(count)
+    if cursor is None:
+        return query.offset((page - 1) * count)
+
+    created_at, row_id = decode_cursor(cursor)
+    return query.where(tuple_(model.created_at, model.id) < (created_at, row_id))
+
+
+async def estimate_row_count(session: AsyncSession, model: Any) -> int | None:
+    """Read the planner's row estimate for a table, or None when unavailable.
+
+    Only PostgreSQL keeps ``pg_class.reltuples``; it is -1 before the first
+    ANALYZE, in which case callers should fall back to an exact count.
+    """
+    if session.get_bind().dialect.name != "postgresql":
+        return None
+    estimate = await session.scalar(
+        text(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"
+        ),
+        {"table": model.__tablename__},
+    )
+    if estimate is None or estimate < 0:
+        return None
+    return int(estimate)
+
+
+def matches_any(
+    session: AsyncSession, column: Any, values: Sequence[Any]
+) -> ColumnElement[bool]:
+    """``column = ANY(:values)`` on PostgreSQL, a plain ``IN`` elsewhere.
+
+    One array parameter keeps the SQL identical for any number of values, so
+    asyncpg reuses a single prepared statement instead of one per list length.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        return column == any_(literal(list(values), ARRAY(column.type)))
+    return column.in_(values)
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import ProcessedMessage
+
+
+class ProcessedMessageRepository:
+    """Async repository for the queue message deduplication table."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def get(self, queue: str, message_id: str) -> ProcessedMessage | None:
+        return await self._session.get(ProcessedMessage, (queue, message_id))
+
+    async def claim(self, queue: str, message_id: str) -> ProcessedMessage:
+        """Insert the key without committing.
+
+        The insert fails, or waits for the other transaction on PostgreSQL, when
+        the same message is being applied concurrently.
+        """
+        record = ProcessedMessage(queue=queue, message_id=message_id)
+        self._session.add(record)
+        await self._session.flush()
+        return record
+
+    async def set_result(
+        self, record: ProcessedMessage, result_id: UUID | None
+    ) -> None:
+        record.result_id = result_id
+        await self._session.flush()
+
+    async def delete_older_than(self, cutoff: datetime) -> int:
+        result = await self._session.execute(
+            delete(ProcessedMessage).where(ProcessedMessage.processed_at < cutoff)
+        )
+        await self._session.commit()
+        return result.rowcount
@@ -1,18 +1,52 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Iterable, Mapping, Sequence
 from uuid import UUID
 
-from sqlalchemy import Select, func, select
+from sqlalchemy import Row, Select, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Product
+from app.repositories.pagination import estimate_row_count, matches_any, paginate
 
 
 class ProductNotFoundError(LookupError):
     """Raised when a product cannot be located."""
 
 
+# Columns read by the read-only list path; what ProductResponse and cursors need.
+PRODUCT_COLUMNS = (
+    Product.id,
+    Product.name,
+    Product.description,
+    Product.price,
+    Product.stock_quantity,
+    Product.created_at,
+)
+
+
+class InsufficientStockError(ValueError):
+    """Raised when one or more order lines cannot be reserved."""
+
+    def __init__(self, shortages: list[tuple[Product, int]]) -> None:
+        self.shortages = shortages
+        super().__init__(
+            "; ".join(
+                self.describe(product.name, requested, product.stock_quantity)
+                for product, requested in shortages
+            )
+        )
+
+    @staticmethod
+    def describe(name: str, requested: int, available: int) -> str:
+        if available <= 0:
+            return f"Product '{name}' is out of stock and cannot be ordered"
+        return (
+            f"Not enough stock for '{name}' "
+            f"({requested} requested, {available} available)"
+        )
+
+
 class ProductRepository:
     """Async repository managing product persistence."""
 
@@ -31,28 +65,158 @@ class ProductRepository:
     async def get_by_id(self, product_id: UUID) -> Product | None:
         return await self._session.get(Product, product_id)
 
+    async def get_many_by_ids(
+        self, product_ids: Iterable[UUID], *, for_update: bool = False
+    ) -> dict[UUID, Product]:
+        """Return products keyed by id, silently skipping unknown identifiers.
+
+        ``for_update`` locks the rows in id order and refreshes loaded instances.
+        """
+        ids = set(product_ids)
+        if not ids:
+            return {}
+        stmt = select(Product).where(matches_any(self._session, Product.id, ids))
+        if for_update:
+            stmt = (
+                stmt.order_by(Product.id)
+                .with_for_update()
+                .execution_options(populate_existing=True)
+            )
+        result = await self._session.execute(stmt)
+        return {product.id: product for product in result.scalars().all()}
+
+    async def get_many_by_names(self, names: Iterable[str]) -> dict[str, Product]:
+        """Return the newest product for each name, mirroring ``get_by_name``."""
+        unique_names = set(names)
+        if not unique_names:
+            return {}
+        stmt = (
+            select(Product)
+            .where(Product.name.in_(unique_names))
+            .order_by(Product.created_at.desc())
+        )
+        result = await self._session.execute(stmt)
+        products: dict[str, Product] = {}
+        for product in result.scalars().all():
+            products.setdefault(product.name, product)
+        return products
+
+    async def lock_rows(
+        self, product_ids: Iterable[UUID], names: Iterable[str] = ()
+    ) -> list[UUID]:
+        """Lock the products with these ids or names in id order; return their ids.
+
+        A transaction that goes on to update several of them in some other order
+        then takes no further row locks, so it keeps the id lock order of
+        ``reserve_stock``.
+        """
+        ids, unique_names = set(product_ids), set(names)
+        conditions = []
+        if ids:
+            conditions.append(matches_any(self._session, Product.id, ids))
+        if unique_names:
+            conditions.append(Product.name.in_(unique_names))
+        if not conditions:
+            return []
+        stmt = (
+            select(Product.id)
+            .where(or_(*conditions))
+            .order_by(Product.id)
+            .with_for_update()
+        )
+        return list((await self._session.scalars(stmt)).all())
+
+    async def reserve_stock(self, quantities: Mapping[UUID, int]) -> None:
+        """Atomically decrement stock for every product or for none of them.
+
+        Each row is claimed with a conditional ``UPDATE ... WHERE stock_quantity >=
+        :q RETURNING`` so concurrent writers can never oversell. Rows are visited in
+        id order, which gives every transaction the same lock order and rules out
+        deadlocks between carts sharing products.
+        """
+        reserved: dict[UUID, int] = {}
+        failed: dict[UUID, int] = {}
+        for product_id in sorted(quantities):
+            quantity = quantities[product_id]
+            stmt = (
+                update(Product)
+                .where(Product.id == product_id, Product.stock_quantity >= quantity)
+                .values(stock_quantity=Product.stock_quantity - quantity)
+                .returning(Product.id)
+                .execution_options(synchronize_session="fetch")
+            )
+            if await self._session.scalar(stmt) is None:
+                failed[product_id] = quantity
+            else:
+                reserved[product_id] = quantity
+
+        if not failed:
+            return
+
+        await self.release_stock(reserved)
+        current = await self.get_many_by_ids(failed)
+        if missing := failed.keys() - current.keys():
+            raise ProductNotFoundError(f"Products {sorted(missing)} not found")
+        for product in current.values():
+            await self._session.refresh(product, ["stock_quantity"])
+        raise InsufficientStockError(
+            [(current[product_id], quantity) for product_id, quantity in failed.items()]
+        )
+
+    async def release_stock(self, quantities: Mapping[UUID, int]) -> None:
+        """Return previously reserved stock to the given products."""
+        for product_id in sorted(quantities):
+            stmt = (
+                update(Product)
+                .where(Product.id == product_id)
+                .values(stock_quantity=Product.stock_quantity + quantities[product_id])
+                .execution_options(synchronize_session="fetch")
+            )
+            await self._session.execute(stmt)
+
     async def list(
         self,
         count: int = 100,
         page: int = 1,
+        cursor: str | None = None,
+        with_total: bool = True,
         **filters: Any,
-    ) -> tuple[list[Product], int]:
+    ) -> tuple[list[Product], int | None]:
         query = self._apply_filters(select(Product), filters)
         total_query = self._apply_filters(
             select(func.count()).select_from(Product), filters
         )
 
-        limited_query = (
-            query.order_by(Product.created_at.desc())
-            .limit(count)
-            .offset((page - 1) * count)
-        )
+        limited_query = paginate(query, Product, count=count, page=page, cursor=cursor)
         result = await self._session.execute(limited_query)
         products = result.scalars().all()
 
+        if not with_total:
+            return products, None
         total = await self._session.scalar(total_query)
         return products, int(total or 0)
 
+    async def list_rows(
+        self,
+        count: int = 100,
+        page: int = 1,
+        cursor: str | None = None,
+        with_total: bool = True,
+        **filters: Any,
+    ) -> tuple[Sequence[Row[Any]], int | None]:
+        """Read-only variant of ``list`` selecting only the response columns."""
+        query = self._apply_filters(select(*PRODUCT_COLUMNS), filters)
+        limited_query = paginate(query, Product, count=count, page=page, cursor=cursor)
+        with self._session.no_autoflush:
+            result = await self._session.execute(limited_query)
+            rows = result.all()
+            if not with_total:
+                return rows, None
+            total = await self._session.scalar(
+                self._apply_filters(select(func.count()).select_from(Product), filters)
+            )
+        return rows, int(total or 0)
+
     async def create(
         self,
         *,
@@ -97,6 +261,10 @@ class ProductRepository:
         await self._session.delete(product)
         await self._session.commit()
 
+    async def estimate_count(self) -> int | None:
+        """Approximate the unfiltered row count without scanning the table."""
+        return await estimate_row_count(self._session, Product)
+
     @staticmethod
     def _apply_filters(query: Select[Any], filters: dict[str, Any]) -> Select[Any]:
         for field, value in filters.items():
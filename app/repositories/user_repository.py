@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Iterable
 from uuid import UUID
 
 from sqlalchemy import Select, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import User
+from app.repositories.pagination import estimate_row_count, matches_any, paginate
 from app.schemas.user import UserCreate, UserUpdate
 
 
@@ -34,37 +35,71 @@ class UserRepository:
         """Return a single user by identifier."""
         return await self._session.get(User, user_id)
 
+    async def get_many_by_ids(self, user_ids: Iterable[UUID]) -> dict[UUID, User]:
+        """Return users keyed by id, skipping unknown identifiers."""
+        ids = set(user_ids)
+        if not ids:
+            return {}
+        stmt = select(User).where(matches_any(self._session, User.id, ids))
+        result = await self._session.execute(stmt)
+        return {user.id: user for user in result.scalars().all()}
+
+    async def get_many_by_emails(self, emails: Iterable[str]) -> dict[str, User]:
+        """Return users keyed by email, skipping unknown addresses."""
+        unique_emails = set(emails)
+        if not unique_emails:
+            return {}
+        stmt = select(User).where(User.email.in_(unique_emails))
+        result = await self._session.execute(stmt)
+        return {user.email: user for user in result.scalars().all()}
+
     async def get_by_filter(
         self,
         count: int,
         page: int,
+        cursor: str | None = None,
+        with_total: bool = True,
         **filters: Any,
-    ) -> tuple[list[User], int]:
+    ) -> tuple[list[User], int | None]:
         """Return paginated users matching the provided filters along with total count."""
         query = self._apply_filters(select(User), filters)
         total_query = self._apply_filters(
             select(func.count()).select_from(User), filters
         )
 
-        limited_query = (
-            query.order_by(User.created_at.desc())
-            .limit(count)
-            .offset((page - 1) * count)
-        )
+        limited_query = paginate(query, User, count=count, page=page, cursor=cursor)
         result = await self._session.execute(limited_query)
         users = result.scalars().all()
 
+        if not with_total:
+            return users, None
         total = await self._session.scalar(total_query)
         return users, int(total or 0)
 
-    async def create(self, user_data: UserCreate) -> User:
-        """Persist a new user."""
+    async def create(self, user_data: UserCreate, *, commit: bool = True) -> User:
+        """Persist a new user.
+
+        With ``commit=False`` the insert is only flushed inside a savepoint, so a
+        unique violation leaves the caller's transaction usable.
+        """
         user = User(**user_data.model_dump())
+        if not commit:
+            async with self._session.begin_nested():
+                self._session.add(user)
+            return user
+
         self._session.add(user)
         await self._session.commit()
         await self._session.refresh(user)
         return user
 
+    async def create_many(self, users_data: list[UserCreate]) -> list[User]:
+        """Flush several new users in one savepoint without committing."""
+        users = [User(**user_data.model_dump()) for user_data in users_data]
+        async with self._session.begin_nested():
+            self._session.add_all(users)
+        return users
+
     async def update(self, user_id: UUID, user_data: UserUpdate) -> User:
         """Update an existing user."""
         user = await self.get_by_id(user_id)
@@ -87,6 +122,10 @@ class UserRepository:
         await self._session.delete(user)
         await self._session.commit()
 
+    async def estimate_count(self) -> int | None:
+        """Approximate the unfiltered row count without scanning the table."""
+        return await estimate_row_count(self._session, User)
+
     @staticmethod
     def _apply_filters(query: Select[Any], filters: dict[str, Any]) -> Select[Any]:
         """Attach equality filters for columns present on the User model."""
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import logging
+import os
+from collections.abc import Mapping
+from typing import Any
+
+from faststream.rabbit import RabbitBroker, RabbitQueue
+from pydantic import ValidationError
+
+logger = logging.getLogger("retry")
+
+# A failed message is delayed RABBIT_RETRY_BASE_MS, doubling on each attempt, and
+# parked in "<queue>.dlq" once it has been tried RABBIT_MAX_ATTEMPTS times.
+RABBIT_MAX_ATTEMPTS = int(os.getenv("RABBIT_MAX_ATTEMPTS", "5"))
+RABBIT_RETRY_BASE_MS = int(os.getenv("RABBIT_RETRY_BASE_MS", "1000"))
+
+ATTEMPTS_HEADER = "x-attempts"
+ERROR_HEADER = "x-last-error"
+# Epoch seconds set by the load generator; echoed back in the consumer's reply.
+PUBLISHED_AT_HEADER = "x-published-at"
+
+# Retrying cannot fix a malformed payload.
+PERMANENT_ERRORS: tuple[type[Exception], ...] = (ValidationError,)
+
+
+def attempts_made(headers: Mapping[str, Any]) -> int:
+    """Number of failed deliveries recorded on a message."""
+    return int(headers.get(ATTEMPTS_HEADER, 0))
+
+
+def retry_delay_ms(attempt: int, base_ms: int = RABBIT_RETRY_BASE_MS) -> int:
+    return base_ms * 2 ** (attempt - 1)
+
+
+def retry_queue(queue: str, attempt: int) -> RabbitQueue:
+    """Delay queue that dead-letters expired messages back to ``queue``.
+
+    Every delay has its own queue (the delay is part of the name), so a long
+    wait never holds up messages with a shorter one.
+    """
+    delay = retry_delay_ms(attempt)
+    return RabbitQueue(
+        f"{queue}.retry.{delay}ms",
+        durable=True,
+        arguments={
+            "x-message-ttl": delay,
+            "x-dead-letter-exchange": "",
+            "x-dead-letter-routing-key": queue,
+        },
+    )
+
+
+def dead_letter_queue(queue: str) -> RabbitQueue:
+    return RabbitQueue(f"{queue}.dlq", durable=True)
+
+
+async def declare_retry_queues(
+    broker: RabbitBroker, queue: str, max_attempts: int = RABBIT_MAX_ATTEMPTS
+) -> None:
+    for attempt in range(1, max_attempts):
+        await broker.declare_queue(retry_queue(queue, attempt))
+    await broker.declare_queue(dead_letter_queue(queue))
+
+
+async def route_failure(
+    broker: RabbitBroker,
+    queue: str,
+    body: bytes,
+    headers: Mapping[str, Any],
+    error: Exception,
+    *,
+    content_type: str | None = None,
+    reply_to: str | None = None,
+    correlation_id: str | None = None,
+    max_attempts: int = RABBIT_MAX_ATTEMPTS,
+) -> str:
+    """Publish a failed message to its next retry queue or to the dead-letter queue.
+
+    Returns the name of the queue the message was sent to. The caller acks the
+    original delivery afterwards, so the broker never redelivers it in a loop.
+    """
+    attempt = attempts_made(headers) + 1
+    if isinstance(error, PERMANENT_ERRORS) or attempt >= max_attempts:
+        target = dead_letter_queue(queue)
+    else:
+        target = retry_queue(queue, attempt)
+
+    await broker.publish(
+        body,
+        queue=target.name,
+        headers={
+            **headers,
+            ATTEMPTS_HEADER: attempt,
+            ERROR_HEADER: f"{type(error).__name__}: {error}"[:500],
+        },
+        content_type=content_type,
+        reply_to=reply_to,
+        correlation_id=correlation_id,
+        persist=True,
+    )
+    logger.warning(
+        "Message from %s failed attempt %d, sent to %s", queue, attempt, target.name
+    )
+    return target.name
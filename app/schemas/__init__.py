@@ -1,7 +1,10 @@
 """Shared application schemas."""
 
+from .metrics import CacheMetrics, DatabasePoolMetrics
 from .order import (
     OrderAddressPayload,
+    OrderBulkResponse,
+    OrderBulkResult,
     OrderCreate,
     OrderItemPayload,
     OrderListResponse,
@@ -18,7 +21,14 @@ from .product import (
     ProductResponse,
     ProductUpdate,
 )
-from .report import OrderReportItem, OrderReportResponse
+from .report import (
+    OrderReportItem,
+    OrderReportResponse,
+    OrderReportRollupItem,
+    OrderReportRollupResponse,
+    OrderReportTopResponse,
+)
+from .serialization import validate_many
 from .user import UserCreate, UserListResponse, UserResponse, UserUpdate
 
 __all__ = [
@@ -32,6 +42,8 @@ __all__ = [
     "ProductResponse",
     "ProductListResponse",
     "OrderCreate",
+    "OrderBulkResult",
+    "OrderBulkResponse",
     "OrderMessage",
     "OrderResponse",
     "OrderListResponse",
@@ -42,4 +54,10 @@ __all__ = [
     "OrderUserPayload",
     "OrderReportItem",
     "OrderReportResponse",
+    "OrderReportRollupItem",
+    "OrderReportRollupResponse",
+    "OrderReportTopResponse",
+    "DatabasePoolMetrics",
+    "CacheMetrics",
+    "validate_many",
 ]
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+
+class DatabasePoolMetrics(BaseModel):
+    size: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+
+
+class CacheMetrics(BaseModel):
+    local_hits: int
+    local_misses: int
+    redis_hits: int
+    redis_misses: int
+    local_entries: int
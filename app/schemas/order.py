@@ -69,6 +69,8 @@ class OrderMessage(BaseModel):
 
     model_config = ConfigDict(extra="forbid")
 
+    # Idempotency key: a message is applied once however often it is delivered.
+    message_id: str | None = Field(default=None, min_length=1, max_length=128)
     action: Literal["create", "update_status"] = "create"
     order_id: UUID | None = None
     user_id: UUID | None = None
@@ -114,8 +116,28 @@ class OrderResponse(BaseModel):
 class OrderListResponse(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
-    total: int
+    total: int | None = None
+    total_estimated: bool = False
     items: list[OrderResponse]
+    next_cursor: str | None = None
+
+
+class OrderBulkResult(BaseModel):
+    """Outcome of a single order within a bulk request."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    index: int
+    order_id: UUID | None = None
+    error: str | None = None
+
+
+class OrderBulkResponse(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    created: int
+    failed: int
+    results: list[OrderBulkResult]
 
 
 class OrderStatusUpdate(BaseModel):
@@ -37,8 +37,10 @@ class ProductResponse(ProductBase):
 class ProductListResponse(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
-    total: int
+    total: int | None = None
+    total_estimated: bool = False
     items: list[ProductResponse]
+    next_cursor: str | None = None
 
 
 class ProductMessage(BaseModel):
@@ -46,6 +48,8 @@ class ProductMessage(BaseModel):
 
     model_config = ConfigDict(extra="forbid")
 
+    # Idempotency key: a message is applied once however often it is delivered.
+    message_id: str | None = Field(default=None, min_length=1, max_length=128)
     action: Literal["create", "update", "mark_out_of_stock"] = "create"
     product_id: UUID | None = None
     name: str | None = None
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from datetime import date
+from typing import Literal
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict
@@ -17,6 +18,34 @@ class OrderReportItem(BaseModel):
 class OrderReportResponse(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
-    report_at: date
+    report_at: date | None = None
+    date_from: date
+    date_to: date
     total: int
+    has_more: bool = False
+    items: list[OrderReportItem]
+
+
+class OrderReportRollupItem(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    period_start: date
+    orders: int
+    count_product: int
+
+
+class OrderReportRollupResponse(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    period: Literal["day", "week", "month"]
+    date_from: date
+    date_to: date
+    items: list[OrderReportRollupItem]
+
+
+class OrderReportTopResponse(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    date_from: date
+    date_to: date
     items: list[OrderReportItem]
@@ -39,5 +39,7 @@ class UserResponse(UserBase):
 class UserListResponse(BaseModel):
     """Paginated user payload."""
 
-    total: int
+    total: int | None = None
+    total_estimated: bool = False
     items: list[UserResponse]
+    next_cursor: str | None = None
@@ -1,8 +1,10 @@
 """Service layer initialization."""
 
+from .idempotency_service import IdempotencyService
 from .order_report_service import OrderReportService
 from .order_service import OrderService
 from .product_service import ProductService
+from .totals import Page, TotalMode, resolve_total_mode
 from .user_service import UserService
 
 __all__ = [
@@ -10,4 +12,8 @@ __all__ = [
     "ProductService",
     "OrderService",
     "OrderReportService",
+    "IdempotencyService",
+    "Page",
+    "TotalMode",
+    "resolve_total_mode",
 ]
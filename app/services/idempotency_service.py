@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from typing import TypeVar
+from uuid import UUID
+
+from app.repositories import ProcessedMessageRepository
+
+# How long a message_id is remembered; redeliveries and DLQ replays of older
+# messages are applied again.
+PROCESSED_MESSAGE_TTL_HOURS = int(os.getenv("PROCESSED_MESSAGE_TTL_HOURS", "72"))
+
+T = TypeVar("T")
+
+
+class IdempotencyService:
+    """Apply a queue message at most once per ``message_id``."""
+
+    def __init__(
+        self, processed_message_repository: ProcessedMessageRepository
+    ) -> None:
+        self._processed_message_repository = processed_message_repository
+
+    async def apply_once(
+        self,
+        queue: str,
+        message_id: str | None,
+        apply: Callable[[], Awaitable[T]],
+        replay: Callable[[UUID], Awaitable[T | None]],
+    ) -> T | None:
+        """Run ``apply`` unless the message was applied before.
+
+        The key is written in the same transaction as the message's changes, so
+        it is only remembered once they are committed. A repeated message is a
+        no-op that returns the stored result through ``replay``.
+        """
+        if message_id is None:
+            return await apply()
+
+        repository = self._processed_message_repository
+        processed = await repository.get(queue, message_id)
+        if processed is not None:
+            if processed.result_id is None:
+                return None
+            return await replay(processed.result_id)
+
+        record = await repository.claim(queue, message_id)
+        result = await apply()
+        await repository.set_result(record, getattr(result, "id", None))
+        return result
+
+    async def purge_expired(self, ttl_hours: int = PROCESSED_MESSAGE_TTL_HOURS) -> int:
+        cutoff = datetime.now() - timedelta(hours=ttl_hours)
+        return await self._processed_message_repository.delete_older_than(cutoff)
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from datetime import date
+from typing import Any
 
 from app.models import OrderReport
-from app.repositories import OrderReportRepository
+from app.repositories import OrderReportRepository, ReportPeriod
 
 
 class OrderReportService:
@@ -14,5 +15,26 @@ class OrderReportService:
         target_date = report_at or date.today()
         return await self._order_report_repository.upsert_for_date(target_date)
 
+    async def refresh_report(self) -> int:
+        """Fold orders changed since the previous run into the report."""
+        return await self._order_report_repository.refresh_changed()
+
     async def get_report(self, report_at: date) -> list[OrderReport]:
         return await self._order_report_repository.get_by_date(report_at)
+
+    async def get_report_range(
+        self, date_from: date, date_to: date, *, count: int, page: int = 1
+    ) -> tuple[list[OrderReport], int]:
+        return await self._order_report_repository.get_range(
+            date_from, date_to, count=count, page=page
+        )
+
+    async def get_rollup(
+        self, date_from: date, date_to: date, period: ReportPeriod
+    ) -> list[Any]:
+        return await self._order_report_repository.rollup(date_from, date_to, period)
+
+    async def get_top_orders(
+        self, date_from: date, date_to: date, limit: int
+    ) -> list[OrderReport]:
+        return await self._order_report_repository.top_orders(date_from, date_to, limit)
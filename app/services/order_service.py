@@ -1,26 +1,43 @@
 from __future__ import annotations
 
+import os
+from typing import Any, Iterable
 from uuid import UUID
 
-from sqlalchemy.exc import IntegrityError
+from redis.asyncio import Redis
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
+from app.cache import DeferredCacheWrites, TieredCache
 from app.models import Address, Order, Product, User
 from app.repositories import (
     AddressRepository,
+    InsufficientStockError,
     OrderRepository,
     ProductNotFoundError,
     ProductRepository,
     UserRepository,
+    next_cursor,
 )
 from app.schemas import (
     OrderAddressPayload,
+    OrderBulkResult,
     OrderCreate,
     OrderItemPayload,
+    OrderListResponse,
     OrderMessage,
+    OrderResponse,
     OrderStatus,
     OrderUserPayload,
     UserCreate,
+    validate_many,
 )
+from app.services.product_service import bump_catalog_generation
+from app.services.totals import TotalMode, fetch_page
+
+ORDER_BULK_CHUNK_SIZE = int(os.getenv("ORDER_BULK_CHUNK_SIZE", "500"))
+ORDER_CACHE_TTL_SECONDS = 600
+
+AddressKey = tuple[UUID, str, str, str, str, str]
 
 
 class OrderService:
@@ -32,14 +49,33 @@ class OrderService:
         product_repository: ProductRepository,
         user_repository: UserRepository,
         address_repository: AddressRepository,
+        cache: Redis | None = None,
+        *,
+        cache_writes: DeferredCacheWrites | None = None,
     ) -> None:
         self._order_repository = order_repository
         self._product_repository = product_repository
         self._user_repository = user_repository
         self._address_repository = address_repository
+        self._cache = cache
+        self._tiers = (
+            TieredCache(cache, deferred=cache_writes) if cache is not None else None
+        )
+
+    async def get_order_by_id(self, order_id: UUID) -> Order | OrderResponse | None:
+        if self._tiers is None:
+            return await self._order_repository.get_by_id(order_id)
 
-    async def get_order_by_id(self, order_id: UUID) -> Order | None:
-        return await self._order_repository.get_by_id(order_id)
+        async def load() -> OrderResponse | None:
+            order = await self._order_repository.get_by_id(order_id)
+            return OrderResponse.model_validate(order) if order else None
+
+        return await self._tiers.get_or_load(
+            self._order_cache_key(order_id),
+            OrderResponse.model_validate_json,
+            load,
+            ORDER_CACHE_TTL_SECONDS,
+        )
 
     async def list_orders(
         self,
@@ -47,29 +83,103 @@ class OrderService:
         count: int = 10,
         page: int = 1,
         status: OrderStatus | None = None,
-    ) -> tuple[list[Order], int]:
+        cursor: str | None = None,
+        total_mode: TotalMode = "exact",
+    ) -> OrderListResponse:
+        """Return an order page; with a cache only the ids come from the database."""
         filters: dict[str, OrderStatus] = {}
         if status:
             filters["status"] = status
-        return await self._order_repository.get_by_filter(
-            count=count, page=page, **filters
+        get_page = (
+            self._order_repository.get_rows_by_filter
+            if self._tiers is None
+            else self._order_repository.get_ids_by_filter
+        )
+
+        async def fetch(with_total: bool) -> tuple[list[Any], int | None]:
+            return await get_page(
+                count=count, page=page, cursor=cursor, with_total=with_total, **filters
+            )
+
+        rows, total, estimated = await fetch_page(
+            fetch,
+            mode=total_mode,
+            namespace="orders",
+            filters=filters,
+            cache=self._cache,
+            estimate=self._order_repository.estimate_count,
+        )
+        if self._tiers is None:
+            orders = validate_many(OrderResponse, rows)
+        else:
+            orders = await self._get_orders_by_ids([row.id for row in rows])
+        return OrderListResponse(
+            total=total,
+            total_estimated=estimated,
+            items=orders,
+            next_cursor=next_cursor(rows, count),
         )
 
     async def update_status(self, order_id: UUID, status: OrderStatus) -> Order:
-        return await self._order_repository.update(order_id, status=status)
+        order = await self._order_repository.update(order_id, status=status)
+        if self._tiers:
+            await self._tiers.invalidate(self._order_cache_key(order_id))
+        return order
 
     async def create_order(self, order_data: OrderCreate) -> Order:
+        """Create an order in a single transaction committed by the last insert."""
         user = await self._resolve_user(order_data.user_id, order_data.user)
         address = await self._resolve_address(
             order_data.address_id, order_data.address, user.id
         )
         items = await self._prepare_items(order_data.items)
-        return await self._order_repository.create(
+        order = await self._order_repository.create(
             user_id=user.id,
             address_id=address.id,
             items=items,
             status=order_data.status,
         )
+        if self._tiers:
+            # Write-through; the broadcast also drops any not-found tombstone.
+            await self._tiers.set(
+                self._order_cache_key(order.id),
+                OrderResponse.model_validate(order),
+                ORDER_CACHE_TTL_SECONDS,
+                broadcast=True,
+            )
+        # Reserved stock changes what the product listing shows.
+        await bump_catalog_generation(self._cache)
+        return order
+
+    async def create_orders_bulk(
+        self,
+        orders: list[OrderCreate],
+        *,
+        chunk_size: int = ORDER_BULK_CHUNK_SIZE,
+    ) -> list[OrderBulkResult]:
+        """Create many orders with set-based lookups and one commit per chunk.
+
+        Every order gets its own result: a failed order never blocks the others,
+        and a database error only rolls back the chunk it happened in.
+        """
+        results: list[OrderBulkResult] = []
+        for start in range(0, len(orders), chunk_size):
+            chunk = dict(enumerate(orders[start : start + chunk_size], start))
+            try:
+                outcomes = await self._create_chunk(chunk)
+            except (SQLAlchemyError, InsufficientStockError) as exc:
+                await self._order_repository.rollback()
+                outcomes = {index: str(exc) for index in chunk}
+
+            for index in chunk:
+                outcome = outcomes[index]
+                if isinstance(outcome, UUID):
+                    results.append(OrderBulkResult(index=index, order_id=outcome))
+                else:
+                    results.append(OrderBulkResult(index=index, error=outcome))
+        if any(result.order_id for result in results):
+            await bump_catalog_generation(self._cache)
+        return results
 
     async def apply_message(self, message: OrderMessage) -> Order:
         if message.action == "create":
@@ -90,6 +200,22 @@ class OrderService:
 
         raise ValueError(f"Unsupported order action: {message.action}")
 
+    async def _get_orders_by_ids(self, order_ids: list[UUID]) -> list[OrderResponse]:
+        """Resolve orders from the cache, loading all misses in one query."""
+        assert self._tiers is not None
+
+        async def load_many(missing: list[UUID]) -> dict[UUID, OrderResponse]:
+            orders = await self._order_repository.get_rows_by_ids(missing)
+            return dict(
+                zip(orders, validate_many(OrderResponse, list(orders.values())))
+            )
+
+        keys = {self._order_cache_key(oid): oid for oid in order_ids}
+        cached = await self._tiers.get_many(
+            keys, OrderResponse.model_validate_json, load_many, ORDER_CACHE_TTL_SECONDS
+        )
+        return [cached[key] for key in keys if key in cached]
+
     async def _resolve_user(
         self, user_id: UUID | None, payload: OrderUserPayload | None
     ) -> User:
@@ -112,7 +238,8 @@ class OrderService:
                     username=payload.username,
                     email=payload.email,
                     description=payload.description,
-                )
+                ),
+                commit=False,
             )
         except IntegrityError as exc:
             # Fall back to fetching an existing user if a race condition occurs.
@@ -155,41 +282,288 @@ class OrderService:
             zip_code=payload.zip_code,
             country=payload.country,
             is_primary=payload.is_primary,
+            commit=False,
         )
 
     async def _prepare_items(
         self, payloads: list[OrderItemPayload]
     ) -> list[dict[str, object]]:
-        items: list[dict[str, object]] = []
+        products = await self._resolve_products(payloads)
+        await self._product_repository.reserve_stock(
+            self._sum_quantities(
+                (product.id, payload.quantity)
+                for payload, product in zip(payloads, products)
+            )
+        )
+        return [
+            {
+                "product_id": product.id,
+                "quantity": payload.quantity,
+                "unit_price": payload.unit_price or product.price,
+            }
+            for payload, product in zip(payloads, products)
+        ]
+
+    async def _resolve_products(
+        self, payloads: list[OrderItemPayload]
+    ) -> list[Product]:
+        products = await self._lookup_products(payloads)
+        if any(product is None for product in products):
+            raise ProductNotFoundError("Product not found for order creation")
+        return products
+
+    async def _lookup_products(
+        self, payloads: list[OrderItemPayload]
+    ) -> list[Product | None]:
+        """Resolve every order line with at most one query per lookup kind."""
+        by_id = await self._product_repository.get_many_by_ids(
+            payload.product_id for payload in payloads if payload.product_id is not None
+        )
+        by_name = await self._product_repository.get_many_by_names(
+            payload.product_name
+            for payload in payloads
+            if payload.product_name and payload.product_id not in by_id
+        )
+
+        products: list[Product | None] = []
         for payload in payloads:
-            product = await self._resolve_product(payload)
-            if product.stock_quantity <= 0:
-                raise ValueError(
-                    f"Product '{product.name}' is out of stock and cannot be ordered"
-                )
-            if payload.quantity > product.stock_quantity:
-                raise ValueError(
-                    f"Not enough stock for '{product.name}' "
-                    f"({payload.quantity} requested, {product.stock_quantity} available)"
+            product = by_id.get(payload.product_id) if payload.product_id else None
+            if product is None and payload.product_name:
+                product = by_name.get(payload.product_name)
+            products.append(product)
+        return products
+
+    async def _create_chunk(
+        self, chunk: dict[int, OrderCreate]
+    ) -> dict[int, UUID | str]:
+        errors: dict[int, str] = {}
+        await self._check_references(chunk, errors)
+        items = await self._allocate_items(chunk, errors)
+        users = await self._resolve_users_bulk(chunk, errors)
+        addresses = await self._resolve_addresses_bulk(chunk, users, errors)
+
+        created = [index for index in chunk if index not in errors]
+        if not created:
+            await self._order_repository.rollback()
+            return dict(errors)
+
+        await self._product_repository.reserve_stock(
+            self._sum_quantities(
+                (item["product_id"], item["quantity"])
+                for index in created
+                for item in items[index]
+            )
+        )
+
+        order_ids = await self._order_repository.create_many(
+            [
+                {
+                    "user_id": users[index].id,
+                    "address_id": addresses[index].id,
+                    "status": chunk[index].status,
+                    "items": items[index],
+                }
+                for index in created
+            ]
+        )
+        outcomes: dict[int, UUID | str] = dict(errors)
+        outcomes.update(zip(created, order_ids))
+        return outcomes
+
+    async def _check_references(
+        self, chunk: dict[int, OrderCreate], errors: dict[int, str]
+    ) -> None:
+        known_users = await self._user_repository.get_many_by_ids(
+            order.user_id for order in chunk.values() if order.user_id
+        )
+        known_addresses = await self._address_repository.get_many_by_ids(
+            order.address_id for order in chunk.values() if order.address_id
+        )
+        for index, order in chunk.items():
+            if order.user_id and order.user_id not in known_users:
+                errors[index] = f"User {order.user_id} not found"
+            elif order.address_id and order.address_id not in known_addresses:
+                errors[index] = f"Address {order.address_id} not found"
+
+    async def _allocate_items(
+        self, chunk: dict[int, OrderCreate], errors: dict[int, str]
+    ) -> dict[int, list[dict[str, object]]]:
+        """Resolve products and hand out locked stock to orders in input order."""
+        pending = [index for index in chunk if index not in errors]
+        payloads = [payload for index in pending for payload in chunk[index].items]
+        resolved = iter(await self._lookup_products(payloads))
+        products = {
+            index: [next(resolved) for _ in chunk[index].items] for index in pending
+        }
+
+        locked = await self._product_repository.get_many_by_ids(
+            (product.id for lines in products.values() for product in lines if product),
+            for_update=True,
+        )
+        available = {
+            product_id: product.stock_quantity for product_id, product in locked.items()
+        }
+
+        items: dict[int, list[dict[str, object]]] = {}
+        for index in pending:
+            if any(
+                product is None or product.id not in locked
+                for product in products[index]
+            ):
+                errors[index] = "Product not found for order creation"
+                continue
+
+            quantities = self._sum_quantities(
+                (product.id, payload.quantity)
+                for payload, product in zip(chunk[index].items, products[index])
+            )
+            shortages = [
+                InsufficientStockError.describe(
+                    locked[product_id].name, quantity, available[product_id]
                 )
+                for product_id, quantity in quantities.items()
+                if quantity > available[product_id]
+            ]
+            if shortages:
+                errors[index] = "; ".join(shortages)
+                continue
 
-            unit_price = payload.unit_price or product.price
-            product.stock_quantity -= payload.quantity
-            items.append(
+            for product_id, quantity in quantities.items():
+                available[product_id] -= quantity
+            items[index] = [
                 {
                     "product_id": product.id,
                     "quantity": payload.quantity,
-                    "unit_price": unit_price,
+                    "unit_price": payload.unit_price or product.price,
                 }
-            )
+                for payload, product in zip(chunk[index].items, products[index])
+            ]
         return items
 
-    async def _resolve_product(self, payload: OrderItemPayload) -> Product:
-        product: Product | None = None
-        if payload.product_id is not None:
-            product = await self._product_repository.get_by_id(payload.product_id)
-        if product is None and payload.product_name:
-            product = await self._product_repository.get_by_name(payload.product_name)
-        if product is None:
-            raise ProductNotFoundError("Product not found for order creation")
-        return product
+    async def _resolve_users_bulk(
+        self, chunk: dict[int, OrderCreate], errors: dict[int, str]
+    ) -> dict[int, User]:
+        pending = [index for index in chunk if index not in errors]
+        by_id = await self._user_repository.get_many_by_ids(
+            chunk[index].user_id for index in pending if chunk[index].user_id
+        )
+        payloads: dict[str, OrderUserPayload] = {}
+        for index in pending:
+            if not chunk[index].user_id:
+                payloads.setdefault(chunk[index].user.email, chunk[index].user)
+        by_email = await self._user_repository.get_many_by_emails(payloads)
+
+        new_users = [
+            UserCreate(
+                username=payload.username,
+                email=payload.email,
+                description=payload.description,
+            )
+            for email, payload in payloads.items()
+            if email not in by_email
+        ]
+        if new_users:
+            by_email.update(
+                (user.email, user) for user in await self._create_users(new_users)
+            )
+
+        users: dict[int, User] = {}
+        for index in pending:
+            order = chunk[index]
+            user = (
+                by_id[order.user_id]
+                if order.user_id
+                else by_email.get(order.user.email)
+            )
+            if user is None:
+                errors[index] = f"User {order.user.email} could not be created"
+            else:
+                users[index] = user
+        return users
+
+    async def _create_users(self, new_users: list[UserCreate]) -> list[User]:
+        """Insert users together, falling back to one savepoint per user."""
+        try:
+            return await self._user_repository.create_many(new_users)
+        except IntegrityError:
+            created: list[User] = []
+            taken: list[str] = []
+            for user_data in new_users:
+                try:
+                    created.append(
+                        await self._user_repository.create(user_data, commit=False)
+                    )
+                except IntegrityError:
+                    taken.append(user_data.email)
+            # A concurrent request may have committed these emails since the
+            # first lookup; its users are just as good for our orders.
+            created.extend(
+                (await self._user_repository.get_many_by_emails(taken)).values()
+            )
+            return created
+
+    async def _resolve_addresses_bulk(
+        self,
+        chunk: dict[int, OrderCreate],
+        users: dict[int, User],
+        errors: dict[int, str],
+    ) -> dict[int, Address]:
+        pending = [index for index in chunk if index not in errors]
+        by_id = await self._address_repository.get_many_by_ids(
+            chunk[index].address_id for index in pending if chunk[index].address_id
+        )
+        by_key: dict[AddressKey, Address] = {
+            self._address_key(address.user_id, address): address
+            for address in await self._address_repository.get_by_user_ids(
+                users[index].id for index in pending if not chunk[index].address_id
+            )
+        }
+
+        missing: dict[AddressKey, dict[str, object]] = {}
+        for index in pending:
+            payload = chunk[index].address
+            if chunk[index].address_id or payload is None:
+                continue
+            key = self._address_key(users[index].id, payload)
+            if key not in by_key:
+                missing.setdefault(
+                    key, {"user_id": users[index].id, **payload.model_dump()}
+                )
+        if missing:
+            created = await self._address_repository.create_many(list(missing.values()))
+            by_key.update(zip(missing, created))
+
+        addresses: dict[int, Address] = {}
+        for index in pending:
+            order = chunk[index]
+            addresses[index] = (
+                by_id[order.address_id]
+                if order.address_id
+                else by_key[self._address_key(users[index].id, order.address)]
+            )
+        return addresses
+
+    @staticmethod
+    def _sum_quantities(lines: Iterable[tuple[UUID, int]]) -> dict[UUID, int]:
+        """Total the requested quantity per product across order lines."""
+        quantities: dict[UUID, int] = {}
+        for product_id, quantity in lines:
+            quantities[product_id] = quantities.get(product_id, 0) + quantity
+        return quantities
+
+    @staticmethod
+    def _address_key(
+        user_id: UUID, address: Address | OrderAddressPayload
+    ) -> AddressKey:
+        return (
+            user_id,
+            address.street,
+            address.city,
+            address.state,
+            address.zip_code,
+            address.country,
+        )
+
+    @staticmethod
+    def _order_cache_key(order_id: UUID) -> str:
+        return f"order:{order_id}"
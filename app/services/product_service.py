@@ -1,57 +1,137 @@
 from __future__ import annotations
 
+from typing import Any
 from uuid import UUID
 
 from redis.asyncio import Redis
 
+from app.cache import DeferredCacheWrites, TieredCache
 from app.models import Product
-from app.repositories import ProductNotFoundError, ProductRepository
-from app.schemas import ProductCreate, ProductMessage, ProductResponse, ProductUpdate
+from app.repositories import ProductNotFoundError, ProductRepository, next_cursor
+from app.schemas import (
+    ProductCreate,
+    ProductListResponse,
+    ProductMessage,
+    ProductResponse,
+    ProductUpdate,
+    validate_many,
+)
+from app.services.totals import TotalMode, fetch_page
 
 PRODUCT_CACHE_TTL_SECONDS = 600
+# List pages are never stale: every product write bumps the generation that is
+# part of their key. The TTL only reclaims pages of old generations.
+PRODUCT_LIST_CACHE_TTL_SECONDS = 600
+CATALOG_GENERATION_KEY = "products:generation"
+
+
+async def bump_catalog_generation(cache: Redis | None) -> None:
+    """Retire every cached product list page; call after the write is committed."""
+    if cache is not None:
+        await cache.incr(CATALOG_GENERATION_KEY)
 
 
 class ProductService:
     """Business logic for product operations."""
 
     def __init__(
-        self, product_repository: ProductRepository, cache: Redis | None = None
+        self,
+        product_repository: ProductRepository,
+        cache: Redis | None = None,
+        *,
+        cache_writes: DeferredCacheWrites | None = None,
     ) -> None:
         self._product_repository = product_repository
         self._cache = cache
+        self._tiers = (
+            TieredCache(cache, deferred=cache_writes) if cache is not None else None
+        )
 
     async def get_product_by_id(
         self, product_id: UUID
     ) -> Product | ProductResponse | None:
-        cache_key = self._product_cache_key(product_id)
-        if self._cache:
-            cached_product = await self._cache.get(cache_key)
-            if cached_product:
-                return ProductResponse.model_validate_json(cached_product)
-
-        product = await self._product_repository.get_by_id(product_id)
-        await self._update_product_cache(product)
-        return product
+        if self._tiers is None:
+            return await self._product_repository.get_by_id(product_id)
+
+        async def load() -> ProductResponse | None:
+            product = await self._product_repository.get_by_id(product_id)
+            return ProductResponse.model_validate(product) if product else None
+
+        return await self._tiers.get_or_load(
+            self._product_cache_key(product_id),
+            ProductResponse.model_validate_json,
+            load,
+            PRODUCT_CACHE_TTL_SECONDS,
+        )
+
+    async def get_products_by_ids(
+        self, product_ids: list[UUID]
+    ) -> list[Product | ProductResponse]:
+        """Return the known products among ``product_ids``, in request order."""
+        ids = list(dict.fromkeys(product_ids))
+        if self._tiers is None:
+            products = await self._product_repository.get_many_by_ids(ids)
+            return [products[pid] for pid in ids if pid in products]
+
+        async def load_many(missing: list[UUID]) -> dict[UUID, ProductResponse]:
+            products = await self._product_repository.get_many_by_ids(missing)
+            return dict(
+                zip(products, validate_many(ProductResponse, list(products.values())))
+            )
+
+        keys = {self._product_cache_key(pid): pid for pid in ids}
+        cached = await self._tiers.get_many(
+            keys,
+            ProductResponse.model_validate_json,
+            load_many,
+            PRODUCT_CACHE_TTL_SECONDS,
+        )
+        return [cached[key] for key in keys if key in cached]
 
     async def list_products(
-        self, *, count: int = 100, page: int = 1
-    ) -> tuple[list[Product], int]:
-        return await self._product_repository.list(count=count, page=page)
+        self,
+        *,
+        count: int = 100,
+        page: int = 1,
+        cursor: str | None = None,
+        total_mode: TotalMode = "exact",
+    ) -> ProductListResponse:
+        """Return a product page, cached in Redis per catalog generation."""
+        if self._cache is None:
+            return await self._load_product_page(count, page, cursor, total_mode)
+
+        generation = await self._cache.get(CATALOG_GENERATION_KEY) or "0"
+        cache_key = (
+            f"products:list:{generation}:{count}:{page}:{cursor or ''}:{total_mode}"
+        )
+        cached_page = await self._cache.get(cache_key)
+        if cached_page is not None:
+            return ProductListResponse.model_validate_json(cached_page)
+
+        product_page = await self._load_product_page(count, page, cursor, total_mode)
+        await self._cache.setex(
+            cache_key, PRODUCT_LIST_CACHE_TTL_SECONDS, product_page.model_dump_json()
+        )
+        return product_page
 
     async def create_product(self, payload: ProductCreate) -> Product:
         product = await self._product_repository.create(**payload.model_dump())
-        await self._update_product_cache(product)
+        # Broadcast so no process keeps a not-found tombstone for this id.
+        await self._update_product_cache(product, broadcast=True)
+        await bump_catalog_generation(self._cache)
         return product
 
     async def update_product(self, product_id: UUID, payload: ProductUpdate) -> Product:
         update_fields = payload.model_dump(exclude_unset=True)
         product = await self._product_repository.update(product_id, **update_fields)
-        await self._update_product_cache(product)
+        await self._update_product_cache(product, broadcast=True)
+        await bump_catalog_generation(self._cache)
         return product
 
     async def mark_out_of_stock(self, product_id: UUID) -> Product:
         product = await self._product_repository.update(product_id, stock_quantity=0)
-        await self._update_product_cache(product)
+        await self._update_product_cache(product, broadcast=True)
+        await bump_catalog_generation(self._cache)
         return product
 
     async def apply_message(self, message: ProductMessage) -> Product:
@@ -93,6 +173,30 @@ class ProductService:
 
         raise ValueError(f"Unsupported product action: {message.action}")
 
+    async def _load_product_page(
+        self, count: int, page: int, cursor: str | None, total_mode: TotalMode
+    ) -> ProductListResponse:
+        async def fetch(with_total: bool) -> tuple[list[Any], int | None]:
+            return await self._product_repository.list_rows(
+                count=count, page=page, cursor=cursor, with_total=with_total
+            )
+
+        # The short-lived count cache would outlive a generation bump, so the
+        # exact total is computed alongside the page it is cached with.
+        products, total, estimated = await fetch_page(
+            fetch,
+            mode=total_mode,
+            namespace="products",
+            filters={},
+            estimate=self._product_repository.estimate_count,
+        )
+        return ProductListResponse(
+            total=total,
+            total_estimated=estimated,
+            items=validate_many(ProductResponse, products),
+            next_cursor=next_cursor(products, count),
+        )
+
     async def _locate_product(
         self, product_id: UUID | None, name: str | None
     ) -> Product:
@@ -105,14 +209,17 @@ class ProductService:
             raise ProductNotFoundError("Product not found for update")
         return product
 
-    async def _update_product_cache(self, product: Product | None) -> None:
-        if self._cache is None or product is None:
+    async def _update_product_cache(
+        self, product: Product | None, *, broadcast: bool = False
+    ) -> None:
+        if self._tiers is None or product is None:
             return
 
-        await self._cache.setex(
+        await self._tiers.set(
             self._product_cache_key(product.id),
+            ProductResponse.model_validate(product),
             PRODUCT_CACHE_TTL_SECONDS,
-            ProductResponse.model_validate(product).model_dump_json(),
+            broadcast=broadcast,
         )
 
     @staticmethod
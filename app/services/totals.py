@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import os
+from typing import Any, Awaitable, Callable, Generic, Literal, NamedTuple, TypeVar
+
+from redis.asyncio import Redis
+
+TotalMode = Literal["exact", "estimated", "none"]
+
+COUNT_CACHE_TTL_SECONDS = int(os.getenv("COUNT_CACHE_TTL_SECONDS", "30"))
+
+T = TypeVar("T")
+
+PageFetcher = Callable[[bool], Awaitable[tuple[list[T], int | None]]]
+
+
+class Page(NamedTuple, Generic[T]):
+    """A list page; ``estimated`` tells whether ``total`` is a planner estimate."""
+
+    items: list[T]
+    total: int | None
+    estimated: bool = False
+
+
+def resolve_total_mode(include_total: bool, estimate_total: bool) -> TotalMode:
+    """Translate the list endpoint query switches into a ``TotalMode``."""
+    if not include_total:
+        return "none"
+    return "estimated" if estimate_total else "exact"
+
+
+async def fetch_page(
+    fetch: PageFetcher[T],
+    *,
+    mode: TotalMode,
+    namespace: str,
+    filters: dict[str, Any],
+    cache: Redis | None = None,
+    estimate: Callable[[], Awaitable[int | None]] | None = None,
+) -> Page[T]:
+    """Load a list page and its total according to ``mode``.
+
+    ``fetch(with_total)`` runs the repository query. Exact totals are cached per
+    filter set for a few seconds; estimates are only used for unfiltered lists,
+    so an ``"estimated"`` request may still come back with an exact total.
+    """
+    if mode == "none":
+        items, _ = await fetch(False)
+        return Page(items, None)
+
+    active = {field: value for field, value in filters.items() if value is not None}
+    if mode == "estimated" and not active and estimate is not None:
+        total = await estimate()
+        if total is not None:
+            items, _ = await fetch(False)
+            return Page(items, total, estimated=True)
+
+    if cache is None:
+        return Page(*await fetch(True))
+
+    cache_key = _count_cache_key(namespace, active)
+    cached_total = await cache.get(cache_key)
+    if cached_total is not None:
+        items, _ = await fetch(False)
+        return Page(items, int(cached_total))
+
+    items, total = await fetch(True)
+    await cache.setex(cache_key, COUNT_CACHE_TTL_SECONDS, str(total))
+    return Page(items, total)
+
+
+def _count_cache_key(namespace: str, filters: dict[str, Any]) -> str:
+    parts = ",".join(f"{field}={filters[field]}" for field in sorted(filters))
+    return f"count:{namespace}:{parts}"
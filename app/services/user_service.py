@@ -5,9 +5,11 @@ from uuid import UUID
 
 from redis.asyncio import Redis
 
+from app.cache import TieredCache
 from app.models import User
 from app.repositories import UserRepository
-from app.schemas import UserCreate, UserResponse, UserUpdate
+from app.schemas import UserCreate, UserResponse, UserUpdate, validate_many
+from app.services.totals import Page, TotalMode, fetch_page
 
 USER_CACHE_TTL_SECONDS = 3600
 
@@ -20,51 +22,85 @@ class UserService:
     ) -> None:
         self._user_repository = user_repository
         self._cache = cache
+        self._tiers = TieredCache(cache) if cache is not None else None
 
     async def get_user_by_id(self, user_id: UUID) -> User | UserResponse | None:
         """Return a single user if present."""
-        cache_key = self._user_cache_key(user_id)
-        if self._cache:
-            cached_user = await self._cache.get(cache_key)
-            if cached_user:
-                return UserResponse.model_validate_json(cached_user)
-
-        user = await self._user_repository.get_by_id(user_id)
-        if user and self._cache:
-            await self._cache.setex(
-                cache_key,
-                USER_CACHE_TTL_SECONDS,
-                UserResponse.model_validate(user).model_dump_json(),
-            )
-        return user
+        if self._tiers is None:
+            return await self._user_repository.get_by_id(user_id)
+
+        async def load() -> UserResponse | None:
+            user = await self._user_repository.get_by_id(user_id)
+            return UserResponse.model_validate(user) if user else None
+
+        return await self._tiers.get_or_load(
+            self._user_cache_key(user_id),
+            UserResponse.model_validate_json,
+            load,
+            USER_CACHE_TTL_SECONDS,
+        )
+
+    async def get_users_by_ids(self, user_ids: list[UUID]) -> list[User | UserResponse]:
+        """Return the known users among ``user_ids``, in request order."""
+        ids = list(dict.fromkeys(user_ids))
+        if self._tiers is None:
+            users = await self._user_repository.get_many_by_ids(ids)
+            return [users[uid] for uid in ids if uid in users]
+
+        async def load_many(missing: list[UUID]) -> dict[UUID, UserResponse]:
+            users = await self._user_repository.get_many_by_ids(missing)
+            return dict(zip(users, validate_many(UserResponse, list(users.values()))))
+
+        keys = {self._user_cache_key(uid): uid for uid in ids}
+        cached = await self._tiers.get_many(
+            keys, UserResponse.model_validate_json, load_many, USER_CACHE_TTL_SECONDS
+        )
+        return [cached[key] for key in keys if key in cached]
 
     async def get_users(
         self,
         count: int,
         page: int,
+        cursor: str | None = None,
+        total_mode: TotalMode = "exact",
         **filters: Any,
-    ) -> tuple[list[User], int]:
-        """Return users and total count."""
-        return await self._user_repository.get_by_filter(
-            count=count, page=page, **filters
+    ) -> Page[User]:
+        """Return users and a total count that is exact, estimated or omitted."""
+
+        async def fetch(with_total: bool) -> tuple[list[User], int | None]:
+            return await self._user_repository.get_by_filter(
+                count=count, page=page, cursor=cursor, with_total=with_total, **filters
+            )
+
+        return await fetch_page(
+            fetch,
+            mode=total_mode,
+            namespace="users",
+            filters=filters,
+            cache=self._cache,
+            estimate=self._user_repository.estimate_count,
         )
 
     async def create_user(self, user_data: UserCreate) -> User:
         """Create a new user."""
-        return await self._user_repository.create(user_data)
+        user = await self._user_repository.create(user_data)
+        if self._tiers:
+            # Clears a not-found tombstone cached for this id.
+            await self._tiers.invalidate(self._user_cache_key(user.id))
+        return user
 
     async def update_user(self, user_id: UUID, user_data: UserUpdate) -> User:
         """Update an existing user."""
         user = await self._user_repository.update(user_id, user_data)
-        if self._cache:
-            await self._cache.delete(self._user_cache_key(user_id))
+        if self._tiers:
+            await self._tiers.invalidate(self._user_cache_key(user_id))
         return user
 
     async def delete_user(self, user_id: UUID) -> None:
         """Remove a user."""
         await self._user_repository.delete(user_id)
-        if self._cache:
-            await self._cache.delete(self._user_cache_key(user_id))
+        if self._tiers:
+            await self._tiers.invalidate(self._user_cache_key(user_id))
 
     @staticmethod
     def _user_cache_key(user_id: UUID) -> str:
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import os
+import zlib
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+# Unacked deliveries per consumer channel and handler tasks per queue. Keep the
+# prefetch at least as large as the worker count so no worker sits idle.
+RABBIT_PREFETCH_COUNT = int(os.getenv("RABBIT_PREFETCH_COUNT", "200"))
+RABBIT_HANDLER_WORKERS = int(os.getenv("RABBIT_HANDLER_WORKERS", "100"))
+
+R = TypeVar("R")
+
+Job = tuple[Callable[[int], Awaitable[Any]], "asyncio.Future[Any]"]
+
+
+class KeyedWorkerPool:
+    """Run handler jobs on a fixed number of workers, each with its own sub-queue.
+
+    Jobs with the same key hash to the same sub-queue and run one after another
+    in arrival order; jobs without a key are spread round-robin. This bounds the
+    number of concurrent handlers while keeping per-key ordering. A job is
+    called with the index of its worker, so callers can pin further resources
+    (such as a database batcher) to it without breaking that ordering.
+    """
+
+    def __init__(self, workers: int = RABBIT_HANDLER_WORKERS) -> None:
+        self._queues: list[asyncio.Queue[Job]] = [
+            asyncio.Queue() for _ in range(max(1, workers))
+        ]
+        self._tasks: list[asyncio.Task[None]] = []
+        self._round_robin = itertools.count()
+
+    async def run(self, key: str | None, job: Callable[[int], Awaitable[R]]) -> R:
+        """Queue ``job`` on the sub-queue for ``key`` and wait for its result."""
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._work(worker, queue))
+                for worker, queue in enumerate(self._queues)
+            ]
+        future: asyncio.Future[R] = asyncio.get_running_loop().create_future()
+        await self._queues[self._slot(key)].put((job, future))
+        return await future
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for queue in self._queues:
+            while not queue.empty():
+                _, future = queue.get_nowait()
+                future.cancel()
+
+    def _slot(self, key: str | None) -> int:
+        if key is None:
+            return next(self._round_robin) % len(self._queues)
+        # crc32 rather than hash(): the slot must not depend on PYTHONHASHSEED.
+        return zlib.crc32(key.encode()) % len(self._queues)
+
+    @staticmethod
+    async def _work(worker: int, queue: asyncio.Queue[Job]) -> None:
+        while True:
+            job, future = await queue.get()
+            if future.done():  # the waiting handler was cancelled
+                continue
+            try:
+                result = await job(worker)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                if not future.done():
+                    future.set_exception(exc)
+            else:
+                if not future.done():
+                    future.set_result(result)
@@ -0,0 +1 @@
+"""Standalone performance benchmarks; see each module for what it needs."""
@@ -0,0 +1,146 @@
+"""Compare entity and column-projected order list pages.
+
+Seeds orders inside a transaction that is rolled back at the end, then loads the
+same ``OrderListResponse`` page through ``get_by_filter`` (full ``Order``
+entities plus ``selectinload``) and ``get_rows_by_filter`` (plain column rows),
+reporting the median time and the memory allocated per page:
+
+    python -m benchmarks.list_queries --orders 10000 --count 100
+    python -m benchmarks.list_queries --url sqlite+aiosqlite:///:memory:
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable
+from uuid import uuid4
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.db import DATABASE_URL
+from app.models import Address, Base, Order, OrderItem, Product, User
+from app.repositories import OrderRepository
+from app.schemas import OrderResponse, validate_many
+
+START = datetime(2025, 1, 1)
+
+
+async def seed(session: AsyncSession, orders: int, items: int) -> None:
+    user_id, address_id = uuid4(), uuid4()
+    await session.execute(
+        insert(User), [{"id": user_id, "username": "bench", "email": "bench@b.ch"}]
+    )
+    await session.execute(
+        insert(Address),
+        [
+            {
+                "id": address_id,
+                "user_id": user_id,
+                "street": "-",
+                "city": "-",
+                "state": "-",
+                "zip_code": "-",
+                "country": "-",
+            }
+        ],
+    )
+    product_ids = [uuid4() for _ in range(items)]
+    await session.execute(
+        insert(Product),
+        [
+            {"id": pid, "name": f"bench {pid}", "description": "", "price": 1.0}
+            for pid in product_ids
+        ],
+    )
+    order_rows = [
+        {
+            "id": uuid4(),
+            "user_id": user_id,
+            "address_id": address_id,
+            "total_price": float(items),
+            "status": "pending",
+            "created_at": START + timedelta(seconds=idx),
+        }
+        for idx in range(orders)
+    ]
+    await session.execute(insert(Order), order_rows)
+    await session.execute(
+        insert(OrderItem),
+        [
+            {"order_id": order["id"], "product_id": pid, "quantity": 1, "unit_price": 1}
+            for order in order_rows
+            for pid in product_ids
+        ],
+    )
+
+
+async def measure(
+    session: AsyncSession,
+    load_page: Callable[[], Awaitable[list[Any]]],
+    repeat: int,
+) -> tuple[float, int]:
+    timings = []
+    for _ in range(repeat):
+        # Every request gets a fresh session in the API; start from an empty map.
+        session.expunge_all()
+        started = time.perf_counter()
+        validate_many(OrderResponse, await load_page())
+        timings.append(time.perf_counter() - started)
+
+    # Traced separately: tracemalloc itself slows allocation-heavy code down.
+    session.expunge_all()
+    tracemalloc.start()
+    validate_many(OrderResponse, await load_page())
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(timings), peak
+
+
+async def main(url: str, orders: int, items: int, count: int, repeat: int) -> None:
+    engine = create_async_engine(url)
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        try:
+            if connection.dialect.name == "sqlite":
+                await connection.run_sync(Base.metadata.create_all)
+            session = AsyncSession(bind=connection, expire_on_commit=False)
+            await seed(session, orders, items)
+            repository = OrderRepository(session)
+
+            async def entities() -> list[Any]:
+                page, _ = await repository.get_by_filter(count=count)
+                return page
+
+            async def rows() -> list[Any]:
+                page, _ = await repository.get_rows_by_filter(count=count)
+                return page
+
+            before = await measure(session, entities, repeat)
+            after = await measure(session, rows, repeat)
+        finally:
+            await transaction.rollback()
+    await engine.dispose()
+
+    print(f"orders={orders} items={items} count={count} repeat={repeat}")
+    for label, (median, peak) in [
+        ("Order entities + selectinload", before),
+        ("column rows                  ", after),
+    ]:
+        print(f"{label} median {median * 1000:.2f} ms, peak {peak / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default=DATABASE_URL)
+    parser.add_argument("--orders", type=int, default=10_000)
+    parser.add_argument("--items", type=int, default=10)
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.orders, args.items, args.count, args.repeat))
@@ -0,0 +1,87 @@
+"""Compare the old and new serialization paths of a list endpoint response.
+
+Builds ``OrderListResponse`` pages from in-memory ORM orders, as ``GET /orders``
+does, and times validation plus JSON encoding. No database is needed:
+
+    python -m benchmarks.list_serialization --orders 100 --items 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from typing import Callable
+from uuid import uuid4
+
+from litestar.plugins.pydantic import PydanticInitPlugin
+from litestar.serialization import encode_json, get_serializer
+
+from app.models import Order, OrderItem
+from app.schemas import OrderListResponse, OrderResponse, validate_many
+
+LITESTAR_SERIALIZER = get_serializer(PydanticInitPlugin.encoders())
+
+
+def build_orders(orders: int, items: int) -> list[Order]:
+    result = []
+    for _ in range(orders):
+        order = Order(
+            id=uuid4(),
+            user_id=uuid4(),
+            address_id=uuid4(),
+            status="pending",
+            total_price=float(items),
+        )
+        for _ in range(items):
+            order.items.append(
+                OrderItem(product_id=uuid4(), quantity=1, unit_price=1.0)
+            )
+        result.append(order)
+    return result
+
+
+def per_row_validation(orders: list[Order]) -> bytes:
+    """Before: one ``model_validate`` per order, encoded by Litestar."""
+    page = OrderListResponse(
+        total=len(orders),
+        items=[OrderResponse.model_validate(order) for order in orders],
+    )
+    return encode_json(page, LITESTAR_SERIALIZER)
+
+
+def list_adapter(orders: list[Order]) -> bytes:
+    """After: one ``TypeAdapter`` call for the page, encoded by pydantic-core."""
+    page = OrderListResponse(
+        total=len(orders), items=validate_many(OrderResponse, orders)
+    )
+    return page.model_dump_json().encode()
+
+
+def measure(path: Callable[[list[Order]], bytes], orders: list[Order], repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        path(orders)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main(orders: int, items: int, repeat: int) -> None:
+    page = build_orders(orders, items)
+    assert per_row_validation(page) == list_adapter(page)
+    before = measure(per_row_validation, page, repeat)
+    after = measure(list_adapter, page, repeat)
+
+    print(f"orders={orders} items={items} repeat={repeat}")
+    print(f"per-row model_validate + Litestar encode  median {before * 1000:.2f} ms")
+    print(f"TypeAdapter + model_dump_json            median {after * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=100)
+    parser.add_argument("--items", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    main(args.orders, args.items, args.repeat)
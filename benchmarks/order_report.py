@@ -0,0 +1,133 @@
+"""Compare the daily order report aggregation before and after the range filter.
+
+Seeds orders spread over several days inside a transaction that is rolled back
+at the end, then times both versions of the aggregate query on PostgreSQL:
+
+    python -m benchmarks.order_report --orders 10000000 --days 365
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import date, datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.db import engine
+from app.models import Order, OrderItem
+
+START = datetime(2025, 1, 1)
+
+
+async def seed(connection: AsyncConnection, orders: int, days: int) -> None:
+    user_id, address_id, product_id = uuid4(), uuid4(), uuid4()
+    await connection.execute(
+        text(
+            "INSERT INTO users (id, username, email, created_at, updated_at) "
+            "VALUES (:id, :name, :name, now(), now())"
+        ),
+        {"id": user_id, "name": f"bench_{user_id}"},
+    )
+    await connection.execute(
+        text(
+            "INSERT INTO addresses (id, user_id, street, city, state, zip_code, "
+            "country, is_primary, created_at, updated_at) VALUES (:id, :user_id, "
+            "'-', '-', '-', '-', '-', false, now(), now())"
+        ),
+        {"id": address_id, "user_id": user_id},
+    )
+    await connection.execute(
+        text(
+            "INSERT INTO products (id, name, description, price, stock_quantity, "
+            "created_at, updated_at) VALUES (:id, 'bench', '', 1, 0, now(), now())"
+        ),
+        {"id": product_id},
+    )
+    await connection.execute(
+        text(
+            "INSERT INTO orders (id, user_id, address_id, total_price, status, "
+            "created_at, updated_at) "
+            "SELECT gen_random_uuid(), :user_id, :address_id, 1, 'pending', "
+            ":start + random() * make_interval(days => :days), now() "
+            "FROM generate_series(1, :orders)"
+        ),
+        {
+            "user_id": user_id,
+            "address_id": address_id,
+            "start": START,
+            "days": days,
+            "orders": orders,
+        },
+    )
+    await connection.execute(
+        text(
+            "INSERT INTO order_items (id, order_id, product_id, quantity, "
+            "unit_price, created_at, updated_at) "
+            "SELECT gen_random_uuid(), id, :product_id, 1, 1, now(), now() "
+            "FROM orders WHERE user_id = :user_id"
+        ),
+        {"product_id": product_id, "user_id": user_id},
+    )
+    await connection.execute(text("ANALYZE orders, order_items"))
+
+
+def expression_query(report_at: date):
+    return (
+        select(Order.id, func.coalesce(func.sum(OrderItem.quantity), 0))
+        .join(OrderItem, Order.items)
+        .where(func.date(Order.created_at) == report_at)
+        .group_by(Order.id)
+    )
+
+
+def range_query(report_at: date):
+    day_start = datetime.combine(report_at, datetime.min.time())
+    return (
+        select(Order.id, func.coalesce(func.sum(OrderItem.quantity), 0))
+        .join(OrderItem, Order.items)
+        .where(
+            Order.created_at >= day_start,
+            Order.created_at < day_start + timedelta(days=1),
+        )
+        .group_by(Order.id)
+    )
+
+
+async def measure(connection: AsyncConnection, query, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await connection.execute(query)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+async def main(orders: int, days: int, repeat: int) -> None:
+    report_at = (START + timedelta(days=days // 2)).date()
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        try:
+            await seed(connection, orders, days)
+            before = await measure(connection, expression_query(report_at), repeat)
+            after = await measure(connection, range_query(report_at), repeat)
+        finally:
+            await transaction.rollback()
+    await engine.dispose()
+
+    print(f"orders={orders} days={days} report_at={report_at}")
+    print(f"date(created_at) = :day      median {before * 1000:.1f} ms")
+    print(f"created_at in [day, day + 1) median {after * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.orders, args.days, args.repeat))
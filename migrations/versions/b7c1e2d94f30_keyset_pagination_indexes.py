@@ -0,0 +1,32 @@
+"""Add (created_at, id) indexes for keyset pagination.
+
+Revision ID: b7c1e2d94f30
+Revises: 4a46ef2a64bd
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c1e2d94f30'
+down_revision: Union[str, Sequence[str], None] = '4a46ef2a64bd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_orders_created_at_id', 'orders', ['created_at', 'id'])
+    op.create_index('ix_products_created_at_id', 'products', ['created_at', 'id'])
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_created_at_id', table_name='users')
+    op.drop_index('ix_products_created_at_id', table_name='products')
+    op.drop_index('ix_orders_created_at_id', table_name='orders')
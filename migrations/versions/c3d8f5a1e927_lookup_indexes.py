@@ -0,0 +1,53 @@
+"""Add indexes for the lookups performed by the repositories.
+
+Revision ID: c3d8f5a1e927
+Revises: b7c1e2d94f30
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d8f5a1e927'
+down_revision: Union[str, Sequence[str], None] = 'b7c1e2d94f30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Status filter plus the keyset ordering used by the order listing.
+    op.create_index(
+        'ix_orders_status_created_at_id',
+        'orders',
+        ['status', 'created_at', 'id'],
+    )
+    op.create_index('ix_orders_user_id', 'orders', ['user_id'])
+    op.create_index('ix_order_items_order_id', 'order_items', ['order_id'])
+    op.create_index('ix_order_items_product_id', 'order_items', ['product_id'])
+    # get_by_name picks the newest product with a given name.
+    op.create_index(
+        'ix_products_name_created_at',
+        'products',
+        ['name', 'created_at'],
+    )
+    # AddressRepository.find_existing matches on all of these columns.
+    op.create_index(
+        'ix_addresses_user_id_lookup',
+        'addresses',
+        ['user_id', 'street', 'city', 'state', 'zip_code', 'country'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_addresses_user_id_lookup', table_name='addresses')
+    op.drop_index('ix_products_name_created_at', table_name='products')
+    op.drop_index('ix_order_items_product_id', table_name='order_items')
+    op.drop_index('ix_order_items_order_id', table_name='order_items')
+    op.drop_index('ix_orders_user_id', table_name='orders')
+    op.drop_index('ix_orders_status_created_at_id', table_name='orders')
@@ -0,0 +1,36 @@
+"""Track incremental order report progress.
+
+Revision ID: d9a4b6c2e518
+Revises: c3d8f5a1e927
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9a4b6c2e518'
+down_revision: Union[str, Sequence[str], None] = 'c3d8f5a1e927'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'report_watermarks',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('order_id', sa.Uuid(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+    op.create_index('ix_orders_updated_at_id', 'orders', ['updated_at', 'id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_orders_updated_at_id', table_name='orders')
+    op.drop_table('report_watermarks')
@@ -0,0 +1,41 @@
+"""Deduplicate queue messages by idempotency key.
+
+Revision ID: e4f2a7c19b03
+Revises: d9a4b6c2e518
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4f2a7c19b03'
+down_revision: Union[str, Sequence[str], None] = 'd9a4b6c2e518'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'processed_messages',
+        sa.Column('queue', sa.String(), nullable=False),
+        sa.Column('message_id', sa.String(), nullable=False),
+        sa.Column('result_id', sa.Uuid(), nullable=True),
+        sa.Column('processed_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('queue', 'message_id'),
+    )
+    op.create_index(
+        'ix_processed_messages_processed_at', 'processed_messages', ['processed_at']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        'ix_processed_messages_processed_at', table_name='processed_messages'
+    )
+    op.drop_table('processed_messages')
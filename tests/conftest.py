@@ -22,15 +22,27 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from app.controllers import OrderController, ProductController, UserController
+from app.controllers import (
+    MetricsController,
+    OrderController,
+    ProductController,
+    ReportController,
+    UserController,
+)
 from app.models import Base
 from app.repositories import (
     AddressRepository,
+    OrderReportRepository,
     OrderRepository,
     ProductRepository,
     UserRepository,
 )
-from app.services import OrderService, ProductService, UserService
+from app.services import (
+    OrderReportService,
+    OrderService,
+    ProductService,
+    UserService,
+)
 
 
 class FakeRedis:
@@ -38,17 +50,93 @@ class FakeRedis:
 
     def __init__(self) -> None:
         self.storage: dict[str, str] = {}
+        self.ttls: dict[str, int] = {}
+        self.published: list[tuple[str, str]] = []
+        self.scripts: list[str] = []
 
     async def get(self, key: str) -> str | None:
         return self.storage.get(key)
 
-    async def setex(self, key: str, _: int, value: str) -> bool:
+    async def set(
+        self, key: str, value: str, nx: bool = False, px: int | None = None
+    ) -> bool | None:
+        if nx and key in self.storage:
+            return None
         self.storage[key] = value
+        if px is not None:
+            self.ttls[key] = px
         return True
 
+    async def setex(self, key: str, ttl: int, value: str) -> bool:
+        self.storage[key] = value
+        self.ttls[key] = ttl * 1000
+        return True
+
+    async def mget(self, keys: list[str]) -> list[str | None]:
+        return [self.storage.get(key) for key in keys]
+
+    async def incr(self, key: str) -> int:
+        value = int(self.storage.get(key, "0")) + 1
+        self.storage[key] = str(value)
+        return value
+
+    async def pttl(self, key: str) -> int:
+        if key not in self.storage:
+            return -2
+        return self.ttls.get(key, -1)
+
     async def delete(self, key: str) -> int:
+        self.ttls.pop(key, None)
         return 1 if self.storage.pop(key, None) is not None else 0
 
+    async def publish(self, channel: str, message: str) -> int:
+        self.published.append((channel, message))
+        return 0
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    def register_script(self, script: str):
+        # The only script in the app is the lock release: compare-and-delete.
+        async def release(keys: list[str], args: list[str]) -> int:
+            self.scripts.append(script)
+            if self.storage.get(keys[0]) != args[0]:
+                return 0
+            return await self.delete(keys[0])
+
+        return release
+
+
+class FakePipeline:
+    """Queues FakeRedis calls and runs them on ``execute``."""
+
+    def __init__(self, redis: FakeRedis) -> None:
+        self._redis = redis
+        self._calls: list = []
+
+    async def __aenter__(self) -> FakePipeline:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._calls.clear()
+
+    def __getattr__(self, name: str):
+        def queue(*args, **kwargs) -> FakePipeline:
+            self._calls.append((getattr(self._redis, name), args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self) -> list:
+        calls, self._calls = self._calls, []
+        return [await call(*args, **kwargs) for call, args, kwargs in calls]
+
+
+@pytest.fixture(scope="function")
+def fake_redis() -> FakeRedis:
+    """In-memory Redis replacement shared within a single test."""
+    return FakeRedis()
+
 
 @pytest.fixture(scope="function")
 def db_session(tmp_path) -> Session:
@@ -151,8 +239,19 @@ def api_client(async_session_factory: async_sessionmaker[AsyncSession]) -> TestC
             address_repository,
         )
 
+    async def provide_order_report_service(
+        db_session: AsyncSession,
+    ) -> OrderReportService:
+        return OrderReportService(OrderReportRepository(db_session))
+
     app = Litestar(
-        route_handlers=[UserController, ProductController, OrderController],
+        route_handlers=[
+            UserController,
+            ProductController,
+            OrderController,
+            ReportController,
+            MetricsController,
+        ],
         dependencies={
             "db_session": Provide(provide_db_session),
             "redis_client": Provide(provide_redis_client),
@@ -163,6 +262,7 @@ def api_client(async_session_factory: async_sessionmaker[AsyncSession]) -> TestC
             "user_service": Provide(provide_user_service),
             "product_service": Provide(provide_product_service),
             "order_service": Provide(provide_order_service),
+            "order_report_service": Provide(provide_order_report_service),
         },
     )
 
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.models import Address, OrderReport, User, db_now
+from app.repositories import (
+    OrderReportRepository,
+    OrderRepository,
+    ProductRepository,
+)
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _create_order(session, product, quantity: int, *, maintain_reports=False):
+    user = User(username=f"report_{quantity}", email=f"report_{quantity}@example.com")
+    session.add(user)
+    await session.flush()
+    address = Address(
+        user_id=user.id,
+        street="Отчётная, 1",
+        city="Москва",
+        state="Московская область",
+        zip_code="101000",
+        country="Россия",
+    )
+    session.add(address)
+    await session.flush()
+    return await OrderRepository(session, maintain_reports=maintain_reports).create(
+        user_id=user.id,
+        address_id=address.id,
+        items=[
+            {"product_id": product.id, "quantity": quantity, "unit_price": 1.0},
+        ],
+    )
+
+
+async def test_refresh_changed_only_processes_new_activity(async_session):
+    report_repo = OrderReportRepository(async_session)
+    product = await ProductRepository(async_session).create(
+        name="Report item", description="", price=1.0, stock_quantity=100
+    )
+    order = await _create_order(async_session, product, 2)
+
+    assert await report_repo.refresh_changed(lag=timedelta(0)) == 1
+    assert await report_repo.refresh_changed(lag=timedelta(0)) == 0
+
+    await OrderRepository(async_session).update(
+        order.id,
+        items=[{"product_id": product.id, "quantity": 5, "unit_price": 1.0}],
+    )
+    await _create_order(async_session, product, 3)
+    assert await report_repo.refresh_changed(lag=timedelta(0), batch_size=1) == 2
+
+    rows = await report_repo.get_by_date(order.created_at.date())
+    assert sorted(row.count_product for row in rows) == [3, 5]
+
+
+async def test_refresh_changed_waits_out_the_lag_on_the_database_clock(
+    async_session,
+):
+    report_repo = OrderReportRepository(async_session)
+    product = await ProductRepository(async_session).create(
+        name="Lagging item", description="", price=1.0, stock_quantity=100
+    )
+    order = await _create_order(async_session, product, 1)
+    db_time = await async_session.scalar(select(db_now()))
+
+    assert order.updated_at <= db_time
+    assert await report_repo.refresh_changed() == 0
+    assert await report_repo.refresh_changed(lag=timedelta(0)) == 1
+
+
+async def test_order_repository_can_maintain_reports_inline(async_session):
+    product = await ProductRepository(async_session).create(
+        name="Inline item", description="", price=1.0, stock_quantity=100
+    )
+    order = await _create_order(async_session, product, 4, maintain_reports=True)
+
+    rows = await OrderReportRepository(async_session).get_by_date(
+        order.created_at.date()
+    )
+    assert [(row.order_id, row.count_product) for row in rows] == [(order.id, 4)]
+
+
+async def test_report_range_rollup_and_top_orders(async_session):
+    report_repo = OrderReportRepository(async_session)
+    product = await ProductRepository(async_session).create(
+        name="Rollup item", description="", price=1.0, stock_quantity=100
+    )
+    placed = {
+        date(2025, 1, 6): await _create_order(async_session, product, 1),
+        date(2025, 1, 8): await _create_order(async_session, product, 4),
+        date(2025, 2, 3): await _create_order(async_session, product, 2),
+    }
+    async_session.add_all(
+        OrderReport(
+            report_at=day, order_id=order.id, count_product=order.items[0].quantity
+        )
+        for day, order in placed.items()
+    )
+    await async_session.commit()
+
+    rows, total = await report_repo.get_range(
+        date(2025, 1, 1), date(2025, 1, 31), count=1, page=2
+    )
+    assert total == 2
+    assert [row.report_at for row in rows] == [date(2025, 1, 8)]
+
+    weekly = await report_repo.rollup(date(2025, 1, 1), date(2025, 2, 28), "week")
+    assert [
+        (str(row.period_start), row.orders, row.count_product) for row in weekly
+    ] == [
+        ("2025-01-06", 2, 5),
+        ("2025-02-03", 1, 2),
+    ]
+    monthly = await report_repo.rollup(date(2025, 1, 1), date(2025, 2, 28), "month")
+    assert [row.count_product for row in monthly] == [5, 2]
+
+    top = await report_repo.top_orders(date(2025, 1, 1), date(2025, 2, 28), 2)
+    assert [row.count_product for row in top] == [4, 2]
@@ -4,6 +4,7 @@ import pytest
 
 from app.models import Address, User
 from app.repositories import OrderNotFoundError, OrderRepository, ProductRepository
+from app.schemas import OrderResponse
 
 pytestmark = pytest.mark.asyncio
 
@@ -67,6 +68,15 @@ async def test_order_repository_handles_multi_item_orders(async_session):
     assert total == 1
     assert orders[0].id == created.id
 
+    rows, total = await order_repo.get_rows_by_filter(count=5, page=1)
+    assert total == 1
+    assert rows[0]["id"] == created.id
+    assert sorted(item["product_id"] for item in rows[0]["items"]) == sorted(
+        [milk.id, bread.id]
+    )
+    assert OrderResponse.model_validate(rows[0]).total_price == created.total_price
+    assert (await order_repo.get_rows_by_ids([created.id]))[created.id] == rows[0]
+
     cheese = await product_repo.create(
         name="Сыр", description="200 г", price=210.0, stock_quantity=15
     )
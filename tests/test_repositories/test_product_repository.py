@@ -1,8 +1,15 @@
 from __future__ import annotations
 
+import asyncio
+
 import pytest
+from sqlalchemy import event
 
-from app.repositories import ProductNotFoundError, ProductRepository
+from app.repositories import (
+    InsufficientStockError,
+    ProductNotFoundError,
+    ProductRepository,
+)
 
 pytestmark = pytest.mark.asyncio
 
@@ -35,3 +42,96 @@ async def test_product_repository_crud(async_session):
 
     with pytest.raises(ProductNotFoundError):
         await repo.delete(created.id)
+
+
+async def test_product_repository_bulk_lookups(async_session):
+    repo = ProductRepository(async_session)
+
+    milk = await repo.create(name="Молоко", description="1 л", price=80.0)
+    bread = await repo.create(name="Хлеб", description="500 г", price=50.0)
+
+    by_id = await repo.get_many_by_ids([milk.id, bread.id, milk.id])
+    assert by_id == {milk.id: milk, bread.id: bread}
+
+    by_name = await repo.get_many_by_names(["Хлеб", "Несуществующий"])
+    assert by_name == {"Хлеб": bread}
+
+    assert await repo.get_many_by_ids([]) == {}
+
+
+async def test_product_repository_reserve_stock_is_all_or_nothing(async_session):
+    repo = ProductRepository(async_session)
+
+    milk = await repo.create(
+        name="Молоко", description="", price=80.0, stock_quantity=5
+    )
+    bread = await repo.create(name="Хлеб", description="", price=50.0, stock_quantity=1)
+    cheese = await repo.create(
+        name="Сыр", description="", price=210.0, stock_quantity=0
+    )
+
+    with pytest.raises(InsufficientStockError) as exc_info:
+        await repo.reserve_stock({milk.id: 2, bread.id: 3, cheese.id: 1})
+
+    failed = {product.id: requested for product, requested in exc_info.value.shortages}
+    assert failed == {bread.id: 3, cheese.id: 1}
+    assert "Not enough stock for 'Хлеб' (3 requested, 1 available)" in str(
+        exc_info.value
+    )
+    assert "Product 'Сыр' is out of stock" in str(exc_info.value)
+    assert milk.stock_quantity == 5
+
+    await repo.reserve_stock({milk.id: 5, bread.id: 1})
+    assert milk.stock_quantity == 0
+    assert bread.stock_quantity == 0
+
+
+async def test_product_repository_reserve_stock_never_oversells(
+    async_session_factory,
+):
+    async with async_session_factory() as session:
+        product = await ProductRepository(session).create(
+            name="Hot item", description="", price=10.0, stock_quantity=50
+        )
+
+    async def reserve_one() -> bool:
+        async with async_session_factory() as session:
+            try:
+                await ProductRepository(session).reserve_stock({product.id: 1})
+            except InsufficientStockError:
+                await session.rollback()
+                return False
+            await session.commit()
+            return True
+
+    results = await asyncio.gather(*(reserve_one() for _ in range(300)))
+
+    assert results.count(True) == 50
+    async with async_session_factory() as session:
+        stored = await ProductRepository(session).get_by_id(product.id)
+        assert stored.stock_quantity == 0
+
+
+async def test_product_repository_locks_rows_in_id_order(async_session):
+    repo = ProductRepository(async_session)
+    products = [
+        await repo.create(name=f"Lock {idx}", description="", price=1.0)
+        for idx in range(4)
+    ]
+    statements: list[str] = []
+
+    def capture(_conn, _cursor, statement, *_args) -> None:
+        statements.append(statement)
+
+    engine = async_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        locked = await repo.lock_rows(
+            [products[3].id, products[0].id], ["Lock 2", "Unknown"]
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert locked == sorted([products[0].id, products[2].id, products[3].id])
+    assert "ORDER BY products.id" in statements[-1]
+    assert await repo.lock_rows([], []) == []
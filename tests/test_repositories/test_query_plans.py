@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import re
+from datetime import date, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event, insert, text
+
+from app.models import Address, Order, OrderItem, Product, User
+from app.repositories import (
+    AddressRepository,
+    OrderReportRepository,
+    OrderRepository,
+    ProductRepository,
+    UserRepository,
+    next_cursor,
+)
+
+pytestmark = pytest.mark.asyncio
+
+ROWS = 2000
+
+# SQLite reports every walk over a whole table or index as "SCAN <table> ...",
+# while index lookups show up as "SEARCH". A scan is only acceptable when the
+# query stops early thanks to LIMIT, i.e. an ordered walk over an index.
+FULL_SCAN = re.compile(r"^SCAN (\w+)")
+
+
+async def _seed(session) -> dict[str, list]:
+    started = datetime(2025, 1, 1)
+    users = [
+        {
+            "id": uuid4(),
+            "username": f"user_{idx}",
+            "email": f"user_{idx}@example.com",
+            "created_at": started + timedelta(minutes=idx),
+        }
+        for idx in range(ROWS)
+    ]
+    addresses = [
+        {
+            "id": uuid4(),
+            "user_id": user["id"],
+            "street": f"Street {idx}",
+            "city": "Москва",
+            "state": "Московская область",
+            "zip_code": "101000",
+            "country": "Россия",
+        }
+        for idx, user in enumerate(users)
+    ]
+    products = [
+        {
+            "id": uuid4(),
+            "name": f"Product {idx}",
+            "description": "",
+            "price": 10.0,
+            "stock_quantity": 100,
+            "created_at": started + timedelta(minutes=idx),
+        }
+        for idx in range(ROWS)
+    ]
+    orders = [
+        {
+            "id": uuid4(),
+            "user_id": users[idx]["id"],
+            "address_id": addresses[idx]["id"],
+            "total_price": 10.0,
+            "status": ("pending", "completed", "cancelled", "processing")[idx % 4],
+            "created_at": started + timedelta(minutes=idx),
+        }
+        for idx in range(ROWS)
+    ]
+    items = [
+        {
+            "order_id": order["id"],
+            "product_id": products[idx]["id"],
+            "quantity": 1,
+            "unit_price": 10.0,
+        }
+        for idx, order in enumerate(orders)
+    ]
+    for model, rows in [
+        (User, users),
+        (Address, addresses),
+        (Product, products),
+        (Order, orders),
+        (OrderItem, items),
+    ]:
+        await session.execute(insert(model), rows)
+    await session.commit()
+    # Give the planner statistics, as autovacuum would on a real database.
+    await session.execute(text("ANALYZE"))
+    return {"users": users, "addresses": addresses, "products": products}
+
+
+async def _full_scans(session, statements: list[tuple[str, tuple]]) -> list[str]:
+    connection = await session.connection()
+    scans = []
+    for statement, parameters in statements:
+        plan = await connection.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {statement}", parameters
+        )
+        for row in plan:
+            if FULL_SCAN.match(row.detail) and (
+                "LIMIT" not in statement or "USING" not in row.detail
+            ):
+                scans.append(f"{row.detail}: {statement}")
+    return scans
+
+
+async def test_repository_queries_use_indexes(async_session):
+    seeded = await _seed(async_session)
+    user = seeded["users"][ROWS // 2]
+    address = seeded["addresses"][ROWS // 2]
+    product = seeded["products"][ROWS // 2]
+
+    orders_repo = OrderRepository(async_session)
+    products_repo = ProductRepository(async_session)
+    users_repo = UserRepository(async_session)
+    addresses_repo = AddressRepository(async_session)
+
+    statements: list[tuple[str, tuple]] = []
+
+    def capture(_conn, _cursor, statement, parameters, _context, _executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    engine = async_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        orders, _ = await orders_repo.get_by_filter(count=20, status="pending")
+        await orders_repo.get_by_filter(
+            count=20, cursor=next_cursor(orders, 20), status="pending"
+        )
+        await orders_repo.get_by_filter(count=20, with_total=False)
+        await orders_repo.get_ids_by_filter(count=20, status="pending")
+        await orders_repo.get_rows_by_ids([order.id for order in orders])
+        await orders_repo.get_rows_by_filter(count=20, status="pending")
+        await orders_repo.get_by_id(orders[0].id)
+
+        await products_repo.get_by_name(product["name"])
+        await products_repo.get_many_by_names([product["name"]])
+        await products_repo.get_many_by_ids([product["id"]])
+        await products_repo.lock_rows([product["id"]], [product["name"]])
+        products, _ = await products_repo.list(count=20, with_total=False)
+        await products_repo.list(
+            count=20, cursor=next_cursor(products, 20), with_total=False
+        )
+        await products_repo.list_rows(count=20, with_total=False)
+
+        await users_repo.get_by_email(user["email"])
+        await users_repo.get_by_username(user["username"])
+        await users_repo.get_many_by_emails([user["email"]])
+        await users_repo.get_by_filter(count=20, page=1, with_total=False)
+
+        await addresses_repo.get_by_user_ids([user["id"]])
+        await addresses_repo.find_existing(
+            user_id=address["user_id"],
+            street=address["street"],
+            city=address["city"],
+            state=address["state"],
+            zip_code=address["zip_code"],
+            country=address["country"],
+        )
+
+        await OrderReportRepository(async_session).upsert_for_date(date(2025, 1, 2))
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert statements
+    assert await _full_scans(async_session, statements) == []
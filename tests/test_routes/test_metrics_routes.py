@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from litestar.status_codes import HTTP_200_OK
+
+
+def test_db_metrics_report_pool_usage(api_client):
+    response = api_client.get("/metrics/db")
+    assert response.status_code == HTTP_200_OK
+
+    body = response.json()
+    assert body["checked_out"] == 0
+    assert body["size"] >= 1
+    assert body["wait_seconds_max"] >= 0
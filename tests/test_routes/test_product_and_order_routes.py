@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 import asyncio
-from uuid import UUID
+from uuid import UUID, uuid4
 
 import pytest
-from litestar.status_codes import HTTP_200_OK
+from litestar.status_codes import HTTP_200_OK, HTTP_400_BAD_REQUEST
 
 from app.repositories import (
     AddressRepository,
@@ -76,3 +76,87 @@ def test_product_and_order_endpoints(seeded_product_and_order, api_client):
     response = api_client.get(f"/orders/{order_id}")
     assert response.status_code == HTTP_200_OK
     assert response.json()["id"] == str(order_id)
+
+
+def test_bulk_order_endpoint_reports_per_order_results(
+    seeded_product_and_order, api_client
+):
+    product_id, _ = seeded_product_and_order
+    order = {
+        "user": {"username": "bulk_route", "email": "bulk_route@example.com"},
+        "address": {
+            "street": "Тестовая, 7",
+            "city": "Москва",
+            "state": "Московская область",
+            "zip_code": "101000",
+            "country": "Россия",
+        },
+        "items": [{"product_id": str(product_id), "quantity": 2}],
+    }
+
+    response = api_client.post("/orders/bulk", json=[order, order])
+    assert response.status_code == HTTP_200_OK
+    payload = response.json()
+    assert payload["created"] == 1
+    assert payload["failed"] == 1
+    assert payload["results"][1]["error"].startswith("Not enough stock")
+
+    response = api_client.post("/orders/bulk", json=[{"items": []}])
+    assert response.status_code == HTTP_400_BAD_REQUEST
+
+    response = api_client.post("/orders/bulk", json=[order] * 10001)
+    assert response.status_code == HTTP_400_BAD_REQUEST
+
+
+def test_report_endpoints_validate_ranges(api_client):
+    response = api_client.get("/report", params={"report_at": "2025-01-01"})
+    assert response.status_code == HTTP_200_OK
+    assert response.json()["total"] == 0
+    assert response.json()["has_more"] is False
+
+    response = api_client.get(
+        "/report",
+        params={"report_at": "2025-01-01", "from": "2025-01-01", "to": "2025-01-02"},
+    )
+    assert response.status_code == HTTP_400_BAD_REQUEST
+
+    response = api_client.get(
+        "/report/rollup",
+        params={"from": "2025-01-01", "to": "2025-03-31", "period": "month"},
+    )
+    assert response.status_code == HTTP_200_OK
+    assert response.json()["items"] == []
+
+    response = api_client.get(
+        "/report/top", params={"from": "2025-02-01", "to": "2025-01-01"}
+    )
+    assert response.status_code == HTTP_400_BAD_REQUEST
+
+    response = api_client.get("/report")
+    assert response.status_code == HTTP_400_BAD_REQUEST
+
+
+def test_products_can_be_fetched_by_ids(seeded_product_and_order, api_client):
+    product_id, _ = seeded_product_and_order
+    unknown_id = uuid4()
+
+    for _ in range(2):  # cold, then served from the cache
+        response = api_client.get(
+            "/products", params={"ids": [str(unknown_id), str(product_id)]}
+        )
+        assert response.status_code == HTTP_200_OK
+        body = response.json()
+        assert body["total"] == 1
+        assert [item["id"] for item in body["items"]] == [str(product_id)]
+
+
+def test_order_list_is_built_from_column_rows(seeded_product_and_order, api_client):
+    product_id, order_id = seeded_product_and_order
+
+    response = api_client.get("/orders", params={"count": 1})
+    assert response.status_code == HTTP_200_OK
+    body = response.json()
+    assert body["total"] == 1
+    assert body["next_cursor"] is not None
+    assert body["items"][0]["id"] == str(order_id)
+    assert body["items"][0]["items"][0]["product_id"] == str(product_id)
@@ -6,6 +6,7 @@ from litestar.status_codes import (
     HTTP_200_OK,
     HTTP_201_CREATED,
     HTTP_204_NO_CONTENT,
+    HTTP_400_BAD_REQUEST,
     HTTP_404_NOT_FOUND,
 )
 
@@ -65,3 +66,24 @@ def test_user_listing_supports_multiple_entries(api_client):
     data = response.json()
     assert data["total"] == 3
     assert len(data["items"]) == 2
+
+
+def test_user_listing_supports_cursor_pagination(api_client):
+    for idx in range(3):
+        api_client.post(
+            "/users",
+            json={"username": f"cursor_{idx}", "email": f"cursor_{idx}@example.com"},
+        )
+
+    first = api_client.get("/users", params={"count": 2}).json()
+    assert [item["username"] for item in first["items"]] == ["cursor_2", "cursor_1"]
+    assert first["next_cursor"]
+
+    second = api_client.get(
+        "/users", params={"count": 2, "cursor": first["next_cursor"]}
+    ).json()
+    assert [item["username"] for item in second["items"]] == ["cursor_0"]
+    assert second["next_cursor"] is None
+
+    response = api_client.get("/users", params={"cursor": "not-a-cursor"})
+    assert response.status_code == HTTP_400_BAD_REQUEST
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models import Order
+from app.repositories import (
+    AddressRepository,
+    OrderRepository,
+    ProcessedMessageRepository,
+    ProductRepository,
+    UserRepository,
+)
+from app.schemas import OrderMessage
+from app.services import IdempotencyService, OrderService
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_redelivered_order_message_is_applied_once(async_session):
+    products = ProductRepository(async_session)
+    orders = OrderRepository(async_session)
+    product = await products.create(
+        name="Idempotent", description="Dedup", price=10.0, stock_quantity=5
+    )
+    service = OrderService(
+        orders,
+        products,
+        UserRepository(async_session),
+        AddressRepository(async_session),
+    )
+    dedup = IdempotencyService(ProcessedMessageRepository(async_session))
+    message = OrderMessage.model_validate(
+        {
+            "message_id": "order-1",
+            "user": {"username": "dedup", "email": "dedup@example.com"},
+            "address": {
+                "street": "Тестовая, 9",
+                "city": "Москва",
+                "state": "Московская область",
+                "zip_code": "101000",
+                "country": "Россия",
+            },
+            "items": [{"product_id": str(product.id), "quantity": 2}],
+        }
+    )
+
+    results = [
+        await dedup.apply_once(
+            "order",
+            message.message_id,
+            lambda: service.apply_message(message),
+            orders.get_by_id,
+        )
+        for _ in range(2)
+    ]
+
+    assert results[0].id == results[1].id
+    assert await async_session.scalar(select(func.count()).select_from(Order)) == 1
+    await async_session.refresh(product)
+    assert product.stock_quantity == 3
+
+    purged = await dedup.purge_expired(ttl_hours=0)
+    assert purged == 1
+    assert (
+        await ProcessedMessageRepository(async_session).get("order", "order-1") is None
+    )
+
+
+async def test_messages_without_id_are_not_deduplicated(async_session):
+    dedup = IdempotencyService(ProcessedMessageRepository(async_session))
+    calls = []
+
+    async def apply():
+        calls.append(True)
+
+    async def replay(_):
+        raise AssertionError("nothing to replay")
+
+    for _ in range(2):
+        await dedup.apply_once("order", None, apply, replay)
+    assert len(calls) == 2
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.batching import MessageBatcher
+from app.cache import DEFERRED_CACHE_WRITES, LOCAL_CACHE
+from app.models import Product
+from app.repositories import ProductNotFoundError, ProductRepository
+from app.retry import ATTEMPTS_HEADER, ERROR_HEADER, retry_queue, route_failure
+from app.schemas import OrderMessage, ProductMessage, ProductResponse
+from app.services import ProductService
+from app.workers import KeyedWorkerPool
+
+pytestmark = pytest.mark.asyncio
+
+
+async def apply_product(session, message: ProductMessage) -> Product:
+    return await ProductService(ProductRepository(session)).apply_message(message)
+
+
+async def test_batch_commits_once_and_isolates_failures(async_engine):
+    commits = []
+    event.listen(async_engine.sync_engine, "commit", commits.append)
+    committed = []
+
+    async def on_commit() -> None:
+        committed.append(True)
+
+    batcher = MessageBatcher(
+        apply_product, async_engine, max_size=10, max_wait_ms=50, on_commit=on_commit
+    )
+    messages = [
+        ProductMessage(
+            action="create", name=f"Batched {i}", description="Batched", price=10.0
+        )
+        for i in range(3)
+    ]
+    messages.insert(1, ProductMessage(action="update", product_id=uuid4(), price=1.0))
+
+    results = await asyncio.gather(
+        *(batcher.submit(message) for message in messages), return_exceptions=True
+    )
+    await batcher.stop()
+
+    assert isinstance(results[1], ProductNotFoundError)
+    assert [product.name for product in results if isinstance(product, Product)] == [
+        "Batched 0",
+        "Batched 1",
+        "Batched 2",
+    ]
+    assert len(commits) == 1
+    assert committed == [True]
+
+    async with async_engine.connect() as connection:
+        stored = await connection.scalar(select(func.count()).select_from(Product))
+    assert stored == 3
+
+
+async def test_handler_failing_after_a_commit_is_rolled_back(async_engine):
+    async def apply(session, message: ProductMessage) -> Product:
+        # ProductRepository.create commits before the handler goes on to fail.
+        product = await ProductRepository(session).create(
+            name=message.name, description="", price=1.0
+        )
+        if message.name == "bad":
+            raise RuntimeError("failed after the commit")
+        return product
+
+    batcher = MessageBatcher(apply, async_engine, max_size=10, max_wait_ms=50)
+    results = await asyncio.gather(
+        *(
+            batcher.submit(ProductMessage(action="create", name=name, price=1.0))
+            for name in ("bad", "good")
+        ),
+        return_exceptions=True,
+    )
+    await batcher.stop()
+
+    assert isinstance(results[0], RuntimeError)
+    assert results[1].name == "good"
+    async with async_engine.connect() as connection:
+        stored = await connection.scalars(select(Product.name))
+        assert stored.all() == ["good"]
+
+
+async def test_prepare_sees_the_whole_batch_before_any_message(async_engine):
+    calls: list[str] = []
+
+    async def prepare(session, messages: list[ProductMessage]) -> None:
+        calls.append("prepare:" + ",".join(message.name for message in messages))
+
+    async def apply(session, message: ProductMessage) -> None:
+        calls.append(message.name)
+
+    batcher = MessageBatcher(
+        apply, async_engine, max_size=10, max_wait_ms=50, prepare=prepare
+    )
+    messages = [ProductMessage(action="update", name=name) for name in "ab"]
+    await asyncio.gather(*(batcher.submit(message) for message in messages))
+    await batcher.stop()
+
+    assert calls == ["prepare:a,b", "a", "b"]
+
+
+async def test_cache_writes_wait_for_the_batch_commit(async_engine, fake_redis):
+    async with AsyncSession(async_engine) as session:
+        product = await ProductRepository(session).create(
+            name="Cached", description="Batched", price=10.0, stock_quantity=1
+        )
+    key = f"product:{product.id}"
+    fake_redis.storage[key] = "stale"
+    LOCAL_CACHE.clear()
+
+    async def apply_cached(session, message: ProductMessage) -> Product:
+        service = ProductService(
+            ProductRepository(session),
+            fake_redis,
+            cache_writes=session.info[DEFERRED_CACHE_WRITES],
+        )
+        product = await service.apply_message(message)
+        # Inside the batch nothing has reached the cache yet.
+        assert fake_redis.storage[key] == "stale"
+        return product
+
+    def fail_commit(_connection) -> None:
+        raise RuntimeError("commit failed")
+
+    batcher = MessageBatcher(apply_cached, async_engine, max_size=1, max_wait_ms=0)
+    update = ProductMessage(action="update", product_id=product.id, price=20.0)
+
+    event.listen(async_engine.sync_engine, "commit", fail_commit)
+    with pytest.raises(RuntimeError):
+        await batcher.submit(update)
+    event.remove(async_engine.sync_engine, "commit", fail_commit)
+    assert key not in fake_redis.storage
+
+    fake_redis.storage[key] = "stale"
+    await batcher.submit(update)
+    await batcher.stop()
+    assert ProductResponse.model_validate_json(fake_redis.storage[key]).price == 20.0
+
+
+async def test_worker_pool_keeps_per_key_order_and_bounds_concurrency():
+    pool = KeyedWorkerPool(workers=2)
+    applied: list[str] = []
+    workers: dict[str, int] = {}
+    running = 0
+    peak = 0
+
+    def job(key: str, delay: float):
+        async def apply(worker: int) -> str:
+            nonlocal running, peak
+            workers[key] = worker
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(delay)
+            applied.append(key)
+            running -= 1
+            return key
+
+        return apply
+
+    results = await asyncio.gather(
+        pool.run("product-a", job("a1", 0.03)),
+        pool.run("product-a", job("a2", 0)),
+        *(pool.run(None, job(f"n{i}", 0.01)) for i in range(4)),
+    )
+    await pool.stop()
+
+    assert results[:2] == ["a1", "a2"]
+    assert applied.index("a1") < applied.index("a2")
+    assert workers["a1"] == workers["a2"]
+    assert set(workers.values()) == {0, 1}
+    assert peak <= 2
+
+
+class RecordingBroker:
+    def __init__(self) -> None:
+        self.published: list[tuple[str, bytes, dict]] = []
+
+    async def publish(self, body, *, queue, headers, **_) -> None:
+        self.published.append((queue, body, headers))
+
+
+async def test_failed_messages_are_retried_with_backoff_then_dead_lettered():
+    broker = RecordingBroker()
+    body = b'{"action": "update_status"}'
+
+    first = await route_failure(broker, "order", body, {}, ValueError("Not enough"))
+    second = await route_failure(
+        broker, "order", body, {ATTEMPTS_HEADER: 1}, ValueError("Not enough")
+    )
+    last = await route_failure(
+        broker, "order", body, {ATTEMPTS_HEADER: 4}, ValueError("Not enough")
+    )
+    assert [first, second, last] == [
+        "order.retry.1000ms",
+        "order.retry.2000ms",
+        "order.dlq",
+    ]
+    assert retry_queue("order", 2).arguments["x-dead-letter-routing-key"] == "order"
+    assert broker.published[-1][2][ATTEMPTS_HEADER] == 5
+    assert broker.published[-1][2][ERROR_HEADER] == "ValueError: Not enough"
+
+    with pytest.raises(ValidationError) as invalid:
+        OrderMessage.model_validate_json(body)
+    assert await route_failure(broker, "order", body, {}, invalid.value) == "order.dlq"
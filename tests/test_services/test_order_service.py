@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import asyncio
+
 import pytest
+from sqlalchemy import event
 
 from app.repositories import (
     AddressRepository,
+    InsufficientStockError,
     OrderRepository,
     ProductRepository,
     UserRepository,
@@ -13,18 +17,20 @@ from app.schemas import (
     OrderCreate,
     OrderItemPayload,
     OrderUserPayload,
+    UserCreate,
 )
 from app.services import OrderService
 
 pytestmark = pytest.mark.asyncio
 
 
-def build_order_service(async_session) -> OrderService:
+def build_order_service(async_session, cache=None) -> OrderService:
     return OrderService(
         OrderRepository(async_session),
         ProductRepository(async_session),
         UserRepository(async_session),
         AddressRepository(async_session),
+        cache,
     )
 
 
@@ -95,3 +101,212 @@ async def test_order_service_rejects_out_of_stock(async_session):
                 status="pending",
             )
         )
+
+
+async def test_order_service_creates_order_in_single_commit(async_session):
+    order_service = build_order_service(async_session)
+    product_repo = ProductRepository(async_session)
+    cable = await product_repo.create(
+        name="Cable", description="", price=5.0, stock_quantity=10
+    )
+
+    commits: list[object] = []
+
+    def record_commit(connection) -> None:
+        commits.append(connection)
+
+    engine = async_session.bind.sync_engine
+    event.listen(engine, "commit", record_commit)
+    try:
+        order = await order_service.create_order(
+            OrderCreate(
+                user=OrderUserPayload(
+                    username="single_commit_user",
+                    email="single_commit_user@example.com",
+                ),
+                address=OrderAddressPayload(
+                    street="Commit st. 1",
+                    city="Москва",
+                    state="Московская область",
+                    zip_code="101000",
+                    country="Россия",
+                ),
+                items=[
+                    OrderItemPayload(product_id=cable.id, quantity=3),
+                    OrderItemPayload(product_name="Cable", quantity=1),
+                ],
+            )
+        )
+    finally:
+        event.remove(engine, "commit", record_commit)
+
+    assert len(commits) == 1
+    assert len(order.items) == 2
+    assert cable.stock_quantity == 6
+
+
+async def test_concurrent_orders_never_oversell(async_session_factory):
+    async with async_session_factory() as session:
+        product = await ProductRepository(session).create(
+            name="Hot item", description="", price=10.0, stock_quantity=50
+        )
+        user = await UserRepository(session).create(
+            UserCreate(username="hot_buyer", email="hot_buyer@example.com")
+        )
+        address = await AddressRepository(session).create(
+            user_id=user.id,
+            street="Горячая, 1",
+            city="Москва",
+            state="Московская область",
+            zip_code="101000",
+            country="Россия",
+        )
+
+    async def place_order() -> bool:
+        # Every order runs in its own session, as concurrent requests would.
+        async with async_session_factory() as session:
+            try:
+                await build_order_service(session).create_order(
+                    OrderCreate(
+                        user_id=user.id,
+                        address_id=address.id,
+                        items=[OrderItemPayload(product_id=product.id, quantity=1)],
+                    )
+                )
+            except InsufficientStockError:
+                await session.rollback()
+                return False
+            return True
+
+    results = await asyncio.gather(*(place_order() for _ in range(300)))
+
+    assert results.count(True) == 50
+    async with async_session_factory() as session:
+        stored = await ProductRepository(session).get_by_id(product.id)
+        assert stored.stock_quantity == 0
+        orders, _ = await OrderRepository(session).get_by_filter(count=100, page=1)
+        assert len(orders) == 50
+
+
+async def test_order_service_creates_orders_in_bulk(async_session):
+    order_service = build_order_service(async_session)
+    product_repo = ProductRepository(async_session)
+    lamp = await product_repo.create(
+        name="Lamp", description="", price=30.0, stock_quantity=3
+    )
+
+    def bulk_order(email: str, quantity: int, **item) -> OrderCreate:
+        return OrderCreate(
+            user=OrderUserPayload(username=email.split("@")[0], email=email),
+            address=OrderAddressPayload(
+                street="Bulk st. 1",
+                city="Москва",
+                state="Московская область",
+                zip_code="101000",
+                country="Россия",
+            ),
+            items=[OrderItemPayload(quantity=quantity, **item)],
+        )
+
+    results = await order_service.create_orders_bulk(
+        [
+            bulk_order("bulk_a@example.com", 2, product_id=lamp.id),
+            bulk_order("bulk_b@example.com", 1, product_name="Missing"),
+            bulk_order("bulk_a@example.com", 2, product_name="Lamp"),
+            bulk_order("bulk_c@example.com", 1, product_id=lamp.id),
+        ],
+        chunk_size=2,
+    )
+
+    assert [result.index for result in results] == [0, 1, 2, 3]
+    assert results[0].order_id is not None
+    assert results[1].error == "Product not found for order creation"
+    assert results[2].error == "Not enough stock for 'Lamp' (2 requested, 1 available)"
+    assert results[3].order_id is not None
+
+    await async_session.refresh(lamp)
+    assert lamp.stock_quantity == 0
+    first = await order_service.get_order_by_id(results[0].order_id)
+    assert first.total_price == pytest.approx(60.0)
+    assert [item.product_id for item in first.items] == [lamp.id]
+
+
+async def test_bulk_orders_use_users_created_concurrently(async_session, monkeypatch):
+    order_service = build_order_service(async_session)
+    lamp = await ProductRepository(async_session).create(
+        name="Raced lamp", description="", price=30.0, stock_quantity=3
+    )
+    await UserRepository(async_session).create(
+        UserCreate(username="raced_buyer", email="raced_buyer@example.com")
+    )
+
+    # The first lookup misses the user, as if another request inserted it just
+    # after; the insert then hits the unique constraint.
+    lookup = UserRepository.get_many_by_emails
+    calls = 0
+
+    async def racing_lookup(self, emails):
+        nonlocal calls
+        calls += 1
+        return {} if calls == 1 else await lookup(self, emails)
+
+    monkeypatch.setattr(UserRepository, "get_many_by_emails", racing_lookup)
+    results = await order_service.create_orders_bulk(
+        [
+            OrderCreate(
+                user=OrderUserPayload(
+                    username="raced_buyer", email="raced_buyer@example.com"
+                ),
+                address=OrderAddressPayload(
+                    street="Гонки, 1",
+                    city="Москва",
+                    state="Московская область",
+                    zip_code="101000",
+                    country="Россия",
+                ),
+                items=[OrderItemPayload(product_id=lamp.id, quantity=1)],
+            )
+        ]
+    )
+
+    assert results[0].error is None
+    assert results[0].order_id is not None
+
+
+async def test_orders_are_cached_on_create_and_invalidated_on_status(
+    async_session, fake_redis
+):
+    order_service = build_order_service(async_session, fake_redis)
+    product = await ProductRepository(async_session).create(
+        name="Cached order product", description="", price=5.0, stock_quantity=5
+    )
+    order = await order_service.create_order(
+        OrderCreate(
+            user=OrderUserPayload(
+                username="cached_order_user",
+                email="cached_order_user@example.com",
+            ),
+            address=OrderAddressPayload(
+                street="Cache st. 1",
+                city="Москва",
+                state="Московская область",
+                zip_code="101000",
+                country="Россия",
+            ),
+            items=[OrderItemPayload(product_id=product.id, quantity=1)],
+        )
+    )
+    assert f"order:{order.id}" in fake_redis.storage
+
+    repository = order_service._order_repository
+    repository.get_by_id = None  # served from the cache
+    repository.get_rows_by_ids = None
+    cached = await order_service.get_order_by_id(order.id)
+    assert cached.items[0].product_id == product.id
+    page = await order_service.list_orders(count=10)
+    assert [item.id for item in page.items] == [order.id]
+    del repository.get_by_id, repository.get_rows_by_ids
+
+    await order_service.update_status(order.id, "completed")
+    assert f"order:{order.id}" not in fake_redis.storage
+    assert (await order_service.get_order_by_id(order.id)).status == "completed"
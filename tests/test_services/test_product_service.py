@@ -1,7 +1,15 @@
 from __future__ import annotations
 
+import asyncio
+
 import pytest
 
+from app.cache import (
+    CACHE_INVALIDATION_CHANNEL,
+    CACHE_STATS,
+    LOCAL_CACHE,
+    RELEASE_LOCK_SCRIPT,
+)
 from app.repositories import ProductRepository
 from app.schemas import ProductCreate, ProductUpdate
 from app.services import ProductService
@@ -44,3 +52,99 @@ async def test_product_service_marks_out_of_stock(async_session):
 
     depleted = await service.mark_out_of_stock(created.id)
     assert depleted.stock_quantity == 0
+
+
+async def test_product_reads_are_served_from_local_tier(async_session, fake_redis):
+    repo = ProductRepository(async_session)
+    service = ProductService(repo, fake_redis)
+    created = await service.create_product(
+        ProductCreate(name="Hot product", description="", price=10.0, stock_quantity=3)
+    )
+    key = f"product:{created.id}"
+    LOCAL_CACHE.delete(key)
+
+    hits = CACHE_STATS.snapshot()
+    first = await service.get_product_by_id(created.id)
+    second = await service.get_product_by_id(created.id)
+    after = CACHE_STATS.snapshot()
+
+    assert first is second
+    assert after["redis_hits"] - hits["redis_hits"] == 1
+    assert after["local_hits"] - hits["local_hits"] == 1
+
+    await service.mark_out_of_stock(created.id)
+    assert LOCAL_CACHE.get(key).stock_quantity == 0
+    channel, message = fake_redis.published[-1]
+    assert channel == CACHE_INVALIDATION_CHANNEL
+    assert message.endswith(f"|{key}")
+
+
+async def test_concurrent_misses_load_product_once(async_session, fake_redis):
+    repo = ProductRepository(async_session)
+    service = ProductService(repo, fake_redis)
+    created = await service.create_product(
+        ProductCreate(name="Popular", description="", price=10.0, stock_quantity=3)
+    )
+    key = f"product:{created.id}"
+    LOCAL_CACHE.delete(key)
+    await fake_redis.delete(key)
+
+    loads = 0
+    get_by_id = repo.get_by_id
+
+    async def counting_get_by_id(product_id):
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(0.01)
+        return await get_by_id(product_id)
+
+    repo.get_by_id = counting_get_by_id
+    results = await asyncio.gather(
+        *(service.get_product_by_id(created.id) for _ in range(20))
+    )
+
+    assert loads == 1
+    assert {result.id for result in results} == {created.id}
+    assert key in fake_redis.storage
+    assert f"lock:{key}" not in fake_redis.storage
+    assert fake_redis.scripts == [RELEASE_LOCK_SCRIPT]
+
+
+async def test_miss_waits_for_loader_holding_redis_lock(async_session, fake_redis):
+    repo = ProductRepository(async_session)
+    service = ProductService(repo, fake_redis)
+    created = await service.create_product(
+        ProductCreate(name="Locked", description="", price=10.0, stock_quantity=3)
+    )
+    key = f"product:{created.id}"
+    cached = fake_redis.storage.pop(key)
+    LOCAL_CACHE.delete(key)
+    await fake_redis.set(f"lock:{key}", "other-worker", nx=True, px=5000)
+
+    async def other_worker_finishes() -> None:
+        await asyncio.sleep(0.1)
+        await fake_redis.setex(key, 600, cached)
+
+    repo.get_by_id = None  # the database must not be queried
+    product, _ = await asyncio.gather(
+        service.get_product_by_id(created.id), other_worker_finishes()
+    )
+    assert product.id == created.id
+
+
+async def test_product_list_is_cached_until_a_product_write(async_session, fake_redis):
+    repo = ProductRepository(async_session)
+    service = ProductService(repo, fake_redis)
+    created = await service.create_product(
+        ProductCreate(name="Listed", description="", price=10.0, stock_quantity=3)
+    )
+
+    first = await service.list_products(count=10)
+    repo.list_rows = None  # a cached page must not reach the database
+    assert await service.list_products(count=10) == first
+    assert first.total == 1
+
+    del repo.list_rows
+    await service.update_product(created.id, ProductUpdate(price=20.0))
+    refreshed = await service.list_products(count=10)
+    assert refreshed.items[0].price == 20.0
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from datetime import datetime
+from types import SimpleNamespace
 from unittest.mock import AsyncMock
 from uuid import UUID, uuid4
 
@@ -39,11 +41,13 @@ async def test_get_users_returns_pagination(
 ):
     user_repository_mock.get_by_filter.return_value = (["user1"], 1)
 
-    items, total = await user_service.get_users(count=5, page=2)
+    items, total, _ = await user_service.get_users(count=5, page=2)
 
     assert items == ["user1"]
     assert total == 1
-    user_repository_mock.get_by_filter.assert_awaited_once_with(count=5, page=2)
+    user_repository_mock.get_by_filter.assert_awaited_once_with(
+        count=5, page=2, cursor=None, with_total=True
+    )
 
 
 @pytest.mark.asyncio
@@ -84,3 +88,92 @@ async def test_delete_user_calls_repository(
     await user_service.delete_user(user_id)
 
     user_repository_mock.delete.assert_awaited_once_with(user_id)
+
+
+@pytest.mark.asyncio
+async def test_get_users_can_skip_or_cache_total(
+    user_repository_mock: AsyncMock, fake_redis
+):
+    user_service = UserService(user_repository_mock, fake_redis)
+    user_repository_mock.get_by_filter.return_value = (["user1"], 7)
+
+    _, total, _ = await user_service.get_users(count=5, page=1, total_mode="exact")
+    assert total == 7
+
+    user_repository_mock.get_by_filter.return_value = (["user1"], None)
+    _, total, _ = await user_service.get_users(count=5, page=1, total_mode="exact")
+    assert total == 7
+    assert user_repository_mock.get_by_filter.await_args.kwargs["with_total"] is False
+
+    _, total, _ = await user_service.get_users(count=5, page=1, total_mode="none")
+    assert total is None
+
+
+@pytest.mark.asyncio
+async def test_get_users_flags_only_real_estimates(user_repository_mock: AsyncMock):
+    user_service = UserService(user_repository_mock)
+    user_repository_mock.get_by_filter.return_value = (["user1"], 1)
+
+    user_repository_mock.estimate_count.return_value = 1000
+    page = await user_service.get_users(count=5, page=1, total_mode="estimated")
+    assert (page.total, page.estimated) == (1000, True)
+
+    # No planner statistics (e.g. SQLite): the exact count is used instead.
+    user_repository_mock.estimate_count.return_value = None
+    page = await user_service.get_users(count=5, page=1, total_mode="estimated")
+    assert (page.total, page.estimated) == (1, False)
+
+
+@pytest.mark.asyncio
+async def test_missing_user_is_cached_as_tombstone(
+    user_repository_mock: AsyncMock, fake_redis
+):
+    user_service = UserService(user_repository_mock, fake_redis)
+    user_id = uuid4()
+    user_repository_mock.get_by_id.return_value = None
+
+    assert await user_service.get_user_by_id(user_id) is None
+    assert await user_service.get_user_by_id(user_id) is None
+    user_repository_mock.get_by_id.assert_awaited_once_with(user_id)
+
+    user_repository_mock.create.return_value = SimpleNamespace(id=user_id)
+    await user_service.create_user(
+        UserCreate(username="late", email="late@example.com", description=None)
+    )
+    assert f"user:{user_id}" not in fake_redis.storage
+
+    await user_service.get_user_by_id(user_id)
+    assert user_repository_mock.get_by_id.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_users_by_ids_loads_only_cache_misses(
+    user_repository_mock: AsyncMock, fake_redis
+):
+    user_service = UserService(user_repository_mock, fake_redis)
+    cached_id, missing_id, unknown_id = uuid4(), uuid4(), uuid4()
+    now = datetime.now()
+
+    def make_user(user_id: UUID) -> SimpleNamespace:
+        return SimpleNamespace(
+            id=user_id,
+            username=f"user_{user_id.hex[:8]}",
+            email=f"{user_id.hex[:8]}@example.com",
+            description=None,
+            created_at=now,
+            updated_at=now,
+        )
+
+    user_repository_mock.get_by_id.return_value = make_user(cached_id)
+    await user_service.get_user_by_id(cached_id)
+    user_repository_mock.get_many_by_ids.return_value = {
+        missing_id: make_user(missing_id)
+    }
+
+    users = await user_service.get_users_by_ids([missing_id, unknown_id, cached_id])
+
+    assert [user.id for user in users] == [missing_id, cached_id]
+    user_repository_mock.get_many_by_ids.assert_awaited_once_with(
+        [missing_id, unknown_id]
+    )
+    assert fake_redis.storage[f"user:{unknown_id}"] == "null"